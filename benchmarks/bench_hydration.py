@@ -0,0 +1,62 @@
+"""Benchmark of translating the raw items of result pages to model items
+with :meth:`~bynamodb.model.Model.from_raw_data`.
+
+No DynamoDB server is needed, as the raw pages are generated::
+
+    $ PYTHONPATH=. python benchmarks/bench_hydration.py [items] [repeat]
+
+"""
+import sys
+import timeit
+
+from bynamodb.attributes import (BooleanAttribute, ListAttribute,
+                                 MapAttribute, NumberAttribute,
+                                 StringAttribute, StringSetAttribute)
+from bynamodb.model import Model
+
+
+class BenchmarkModel(Model):
+    table_name = 'Benchmark'
+
+    user_id = StringAttribute(hash_key=True)
+    created_at = NumberAttribute(range_key=True)
+    name = StringAttribute()
+    email = StringAttribute()
+    age = NumberAttribute()
+    score = NumberAttribute()
+    active = BooleanAttribute()
+    tags = StringSetAttribute()
+    history = ListAttribute()
+    profile = MapAttribute()
+
+
+def make_raw_item(i):
+    return {
+        'user_id': {'S': 'user-{0}'.format(i)},
+        'created_at': {'N': str(1400000000 + i)},
+        'name': {'S': 'Name {0}'.format(i)},
+        'email': {'S': 'user{0}@example.com'.format(i)},
+        'age': {'N': str(20 + i % 50)},
+        'score': {'N': '{0}.5'.format(i)},
+        'active': {'BOOL': i % 2 == 0},
+        'tags': {'SS': ['a', 'b', 'tag-{0}'.format(i % 10)]},
+        'history': {'L': [{'N': str(n)} for n in range(3)]},
+        'profile': {'M': {'city': {'S': 'Seoul'}, 'zip': {'N': '100'}}},
+    }
+
+
+def main(items=10000, repeat=5):
+    page = [make_raw_item(i) for i in range(items)]
+    from_raw_data = BenchmarkModel.from_raw_data
+
+    def hydrate():
+        for item_raw in page:
+            from_raw_data(item_raw)
+
+    best = min(timeit.repeat(hydrate, number=1, repeat=repeat))
+    print('{0} items in {1:.3f} s: {2:,.0f} items/sec'.format(
+        items, best, items / best))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
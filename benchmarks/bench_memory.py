@@ -0,0 +1,69 @@
+"""Benchmark of the memory per item of a 20-attribute model with
+the compact item storage and with the default :class:`dict` storage.
+
+No DynamoDB server is needed, as the items are translated from
+generated raw data::
+
+    $ PYTHONPATH=. python benchmarks/bench_memory.py [items]
+
+"""
+import sys
+
+from bynamodb.attributes import NumberAttribute, StringAttribute
+from bynamodb.model import Model
+
+
+ATTRIBUTES = 20
+
+
+def make_model(name, compact):
+    dct = {
+        'table_name': name,
+        'compact': compact,
+        'attr_0': StringAttribute(hash_key=True),
+    }
+    for i in range(1, ATTRIBUTES):
+        attribute = StringAttribute if i % 2 else NumberAttribute
+        dct['attr_{0}'.format(i)] = attribute()
+    return type(name, (Model,), dct)
+
+
+def make_raw_item(i):
+    item_raw = {'attr_0': {'S': 'item-{0}'.format(i)}}
+    for n in range(1, ATTRIBUTES):
+        if n % 2:
+            item_raw['attr_{0}'.format(n)] = {'S': 'value-{0}'.format(n)}
+        else:
+            item_raw['attr_{0}'.format(n)] = {'N': str(i * n)}
+    return item_raw
+
+
+def sizeof(item):
+    """The bytes of the item and the containers of its state. The attribute
+    values are not counted, as they are the same for both storages.
+
+    """
+    size = sys.getsizeof(item)
+    if hasattr(item, '__dict__'):
+        size += sys.getsizeof(item.__dict__)
+    for name in ('_data', '_raw', '_loaded', '_dirty'):
+        value = getattr(item, name)
+        if value is not None:
+            size += sys.getsizeof(value)
+    values = getattr(item._data, '_values', None)
+    if values is not None:
+        size += sys.getsizeof(values)
+    return size
+
+
+def main(items=10000):
+    page = [make_raw_item(i) for i in range(items)]
+    for name, compact in [('DictItem', False), ('CompactItem', True)]:
+        model = make_model(name, compact)
+        items = [model.from_raw_data(item_raw) for item_raw in page]
+        size = sum(sizeof(item) for item in items) / len(items)
+        print('{0:12} {1} bytes/item'.format(name, size))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -1,8 +1,15 @@
+import copy
+
 from boto.dynamodb.types import Dynamizer
 from boto.dynamodb2.types import (STRING, STRING_SET, BINARY, BINARY_SET,
                                   NUMBER_SET, LIST, MAP, BOOLEAN, NUMBER)
 
 
+# Dynamizer is stateless, so a single instance is shared by all attributes
+# instead of creating one per value.
+_dynamizer = Dynamizer()
+
+
 class Attribute(object):
     """Declare the attribute of the model as a descriptor."""
 
@@ -18,6 +25,11 @@ class Attribute(object):
     # (:class:`str`) Type string defined in :mod:`boto.dynamodb2.types`
     type = None
 
+    # (:class:`bool`) `True` if the value can be mutated in place. The value
+    # of such an attribute is copied when it is first read, so that saving
+    # the item detects the changes made in place.
+    mutable = False
+
     def __init__(self, hash_key=False, range_key=False,
                  null=False, default=None):
         self.hash_key = hash_key
@@ -29,13 +41,30 @@ class Attribute(object):
             self.null = null
 
     def __get__(self, obj, cls=None):
-        if obj is not None:
-            return obj._data.get(self.attr_name)
-        return self
+        if obj is None:
+            return self
+        value = obj._data.get(self.attr_name)
+        if value is None and obj._raw and self.attr_name in obj._raw:
+            # Lazily decoded item. Once decoded, the value may be mutated,
+            # so the raw value is not kept any more.
+            value = obj._data[self.attr_name] = self.decode(
+                obj._raw.pop(self.attr_name))
+        if self.mutable and value is not None and obj._dirty is not None and \
+                self.attr_name not in obj._dirty:
+            snapshots = obj._snapshots
+            if snapshots is None:
+                snapshots = obj._snapshots = {}
+            if self.attr_name not in snapshots:
+                snapshots[self.attr_name] = copy.deepcopy(value)
+        return value
 
     def __set__(self, obj, value):
         if obj is not None:
             obj._data[self.attr_name] = value
+            if obj._raw:
+                obj._raw.pop(self.attr_name, None)
+            if obj._dirty is not None:
+                obj._dirty.add(self.attr_name)
             return
         raise ValueError('Cannot change the class attribute')
 
@@ -52,10 +81,10 @@ class Attribute(object):
         raise NotImplementedError
 
     def _encode(self, value):
-        return Dynamizer().encode(value)
+        return _dynamizer.encode(value)
 
     def decode(self, value):
-        return Dynamizer().decode(value)
+        return _dynamizer.decode(value)
 
 
 class ScalarAttribute(Attribute):
@@ -79,6 +108,16 @@ class StringAttribute(ScalarAttribute):
     type = STRING
     accepts = (str, unicode)
 
+    def _encode(self, value):
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return {STRING: value}
+
+    def decode(self, value):
+        if STRING in value:
+            return value[STRING]
+        return _dynamizer.decode(value)
+
 
 class BinaryAttribute(ScalarAttribute):
     type = BINARY
@@ -89,11 +128,10 @@ class NumberAttribute(ScalarAttribute):
     type = NUMBER
     accepts = int, float,
 
-    def _encode(self, value):
-        return Dynamizer().encode(value)
-
     def decode(self, value):
-        value = str(Dynamizer().decode(value))
+        # The wire format of the number is already its string representation,
+        # so it is parsed directly without going through the decimal.
+        value = value.get(NUMBER) or str(_dynamizer.decode(value))
         if '.' in value:
             return float(value)
         else:
@@ -104,9 +142,17 @@ class BooleanAttribute(ScalarAttribute):
     type = BOOLEAN
     accepts = bool,
 
+    def _encode(self, value):
+        return {BOOLEAN: value}
+
+    def decode(self, value):
+        if BOOLEAN in value:
+            return value[BOOLEAN]
+        return _dynamizer.decode(value)
+
 
 class DocumentAttribute(ScalarAttribute):
-    pass
+    mutable = True
 
 
 class ListAttribute(DocumentAttribute):
@@ -120,6 +166,7 @@ class MapAttribute(DocumentAttribute):
 
 
 class SetAttribute(Attribute):
+    mutable = True
 
     # (:class:`~bynamodb.attributes.ScalarAttribute`)
     # The type of the elements.
@@ -151,3 +198,16 @@ class BinarySetAttribute(SetAttribute):
 class NumberSetAttribute(SetAttribute):
     type = NUMBER_SET
     set_of = NumberAttribute
+
+
+class VersionAttribute(NumberAttribute):
+    """The number of the writes of the item. Every write of the item
+    increments it, on condition that the version is not changed since the
+    item is loaded, so that concurrent writes do not overwrite each other.
+    The write of the outdated item raises
+    :exc:`boto.dynamodb2.exceptions.ConditionalCheckFailedException`.
+
+    """
+
+    def __init__(self):
+        super(VersionAttribute, self).__init__(null=True)
@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class Cache(object):
+    """Backend of the item cache of :attr:`bynamodb.model.Model.cache`.
+
+    The keys are hashable signatures of the primary keys, and the values are
+    the raw items which must not be modified.
+
+    """
+
+    def get(self, key):
+        """Return the cached value, or `None` if missing."""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LRUCache(Cache):
+    """Thread-safe in-process cache which evicts the least recently used
+    values beyond `max_size`, and expires the values after `ttl` seconds.
+
+    :param max_size: the maximum number of the cached values.
+    :type max_size: :class:`int`
+    :param ttl: seconds to keep the values. Never expires if `None`.
+    :type ttl: :class:`numbers.Real`
+
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        #: (:class:`int`) The number of the cache hits.
+        self.hits = 0
+
+        #: (:class:`int`) The number of the cache misses.
+        self.misses = 0
+
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._values.pop(key, None)
+            if entry is None or (entry[1] is not None and
+                                 entry[1] < time.time()):
+                self.misses += 1
+                return None
+            self._values[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.time() + self.ttl
+        with self._lock:
+            self._values.pop(key, None)
+            self._values[key] = (value, expires)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._values.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
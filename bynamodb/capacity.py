@@ -0,0 +1,85 @@
+import threading
+from collections import defaultdict
+
+
+_listeners = []
+
+
+def add_listener(listener):
+    """Register the global hook of the consumed capacity.
+
+    It is called with the operation name such as ``'query'`` and
+    the `ConsumedCapacity` of a response for each table, whenever the models
+    request the consumed capacity. See
+    :attr:`~bynamodb.model.Model.return_consumed_capacity`.
+
+    :param listener: the callable of the operation name and
+                     the consumed capacity.
+
+    """
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    _listeners.remove(listener)
+
+
+def record(operation, consumed_capacity):
+    """Notify the listeners of the consumed capacity of a response, which is
+    a mapping of a table or a list of them.
+
+    """
+    if isinstance(consumed_capacity, dict):
+        consumed_capacity = [consumed_capacity]
+    for listener in list(_listeners):
+        for capacity in consumed_capacity:
+            listener(operation, capacity)
+
+
+def capacity_units(consumed_capacity):
+    """Total capacity units of the consumed capacity of a response."""
+    if not consumed_capacity:
+        return 0
+    if isinstance(consumed_capacity, dict):
+        consumed_capacity = [consumed_capacity]
+    return sum(capacity.get('CapacityUnits', 0)
+               for capacity in consumed_capacity)
+
+
+class CapacityCounter(object):
+    """Listener which sums up the consumed capacity units per table,
+    per index and per operation.
+
+    .. code-block:: python
+
+        counter = CapacityCounter()
+        add_listener(counter)
+
+    """
+
+    def __init__(self):
+        #: (:class:`dict`) The table name to the capacity units.
+        self.tables = defaultdict(float)
+
+        #: (:class:`dict`) The pair of the table name and the index name to
+        #: the capacity units. It is counted only with ``'INDEXES'``.
+        self.indexes = defaultdict(float)
+
+        #: (:class:`dict`) The pair of the table name and the operation name
+        #: to the capacity units.
+        self.operations = defaultdict(float)
+
+        self._lock = threading.Lock()
+
+    def __call__(self, operation, capacity):
+        table_name = capacity['TableName']
+        units = capacity.get('CapacityUnits', 0)
+        with self._lock:
+            self.tables[table_name] += units
+            self.operations[(table_name, operation)] += units
+            for indexes in ('GlobalSecondaryIndexes',
+                            'LocalSecondaryIndexes'):
+                for index_name, index_capacity in \
+                        capacity.get(indexes, {}).items():
+                    self.indexes[(table_name, index_name)] += \
+                        index_capacity.get('CapacityUnits', 0)
@@ -0,0 +1,137 @@
+import re
+
+from boto.dynamodb2.types import BOOLEAN, NUMBER
+
+from .attributes import BooleanAttribute, NumberAttribute
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def iter_columns(model, items_raw, attributes=None, chunk_size=10000):
+    """Decode the raw items into columns of
+    :class:`numpy.ma.MaskedArray` chunk by chunk, without creating the items
+    of the model.
+
+    The dtype of each column follows the attribute declaration. The column
+    of :class:`~bynamodb.attributes.NumberAttribute` is `int64` if all of
+    its values are integers, or `object` if any of them does not fit in
+    `int64`, and `float64` otherwise, so the dtype may differ from chunk to
+    chunk. The column of :class:`~bynamodb.attributes.BooleanAttribute` is
+    `bool`, and the others are `object`. The missing values are masked.
+
+    :param model: the model of the items.
+    :param items_raw: the raw items from the DynamoDBConnection.
+    :type items_raw: :class:`collections.Iterable`
+    :param attributes: the names of the columns.
+                       Defaults to all attributes of the model.
+    :type attributes: :class:`collections.Iterable`
+    :param chunk_size: the number of the items per chunk.
+    :type chunk_size: :class:`int`
+    :returns: iterator of :class:`dict` of the attribute name to the column.
+
+    """
+    builders = _get_builders(model, attributes)
+    count = 0
+    for item_raw in items_raw:
+        for name, builder in builders:
+            builder.append(item_raw.get(name))
+        count += 1
+        if count == chunk_size:
+            yield _build(builders)
+            count = 0
+    if count:
+        yield _build(builders)
+
+
+def to_columns(model, items_raw, attributes=None):
+    """Decode all of the raw items into columns. See :func:`iter_columns`."""
+    builders = _get_builders(model, attributes)
+    for item_raw in items_raw:
+        for name, builder in builders:
+            builder.append(item_raw.get(name))
+    return _build(builders)
+
+
+def _get_builders(model, attributes):
+    if numpy is None:
+        raise ImportError('NumPy is required for the columnar export')
+    model_attributes = model._get_attributes()
+    return [(name, _ColumnBuilder(model_attributes[name]))
+            for name in sorted(attributes or model_attributes)]
+
+
+def _build(builders):
+    return dict((name, builder.build()) for name, builder in builders)
+
+
+_INTEGER = re.compile(r'^-?\d+$')
+
+
+class _ColumnBuilder(object):
+    """Accumulate the decoded values of an attribute."""
+
+    def __init__(self, attr):
+        self.attr = attr
+        if isinstance(attr, NumberAttribute):
+            # The dtype is chosen when the column is built.
+            self.dtype, self.missing = None, None
+            self.decode = self._decode_number
+        elif isinstance(attr, BooleanAttribute):
+            self.dtype, self.missing = numpy.bool_, False
+            self.decode = self._decode_boolean
+        else:
+            self.dtype, self.missing = object, None
+            self.decode = attr.decode
+        self.values = []
+        self.mask = []
+
+    def append(self, value):
+        if value is None:
+            self.values.append(self.missing)
+            self.mask.append(True)
+        else:
+            self.values.append(self.decode(value))
+            self.mask.append(False)
+
+    def build(self):
+        """Build the column from the values appended so far, and reset."""
+        if self.dtype is object:
+            # Lists and dicts must not be broadcast into dimensions.
+            data = numpy.empty(len(self.values), dtype=object)
+            for i, value in enumerate(self.values):
+                data[i] = value
+        elif self.dtype is None:
+            data = self._build_numbers()
+        else:
+            data = numpy.array(self.values, dtype=self.dtype)
+        column = numpy.ma.MaskedArray(data, mask=numpy.array(self.mask,
+                                                             dtype=bool))
+        self.values = []
+        self.mask = []
+        return column
+
+    def _build_numbers(self):
+        values = self.values
+        if all(_INTEGER.match(value) for value in values if value is not None):
+            integers = [0 if value is None else int(value) for value in values]
+            try:
+                return numpy.array(integers, dtype=numpy.int64)
+            except OverflowError:
+                # Integers beyond int64 are not rounded into floats.
+                return numpy.array(integers, dtype=object)
+        return numpy.array([0.0 if value is None else float(value)
+                            for value in values], dtype=numpy.float64)
+
+    def _decode_number(self, value):
+        # The number is kept as its string until the dtype is chosen.
+        if NUMBER in value:
+            return value[NUMBER]
+        return str(self.attr.decode(value))
+
+    def _decode_boolean(self, value):
+        if BOOLEAN in value:
+            return value[BOOLEAN]
+        return self.attr.decode(value)
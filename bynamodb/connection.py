@@ -0,0 +1,146 @@
+import threading
+from contextlib import contextmanager
+from Queue import Empty, Queue
+
+from boto.dynamodb2.layer1 import DynamoDBConnection
+
+from .exceptions import ConnectionPoolTimeoutException
+
+
+class ConnectionManager(object):
+    """Provide :class:`boto.dynamodb2.layer1.DynamoDBConnection` to the
+    models. The base manager shares a single connection with all threads.
+
+    :param kwargs: keyword arguments of
+                   :class:`boto.dynamodb2.layer1.DynamoDBConnection`.
+
+    """
+
+    #: (:class:`int`) The number of the retries which the connections make
+    #: by themselves for the throttled requests. boto's default if `None`.
+    number_retries = None
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get_connection(self):
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self._conn = self.create_connection()
+        return self._conn
+
+    def create_connection(self):
+        conn = DynamoDBConnection(**self.kwargs)
+        if self.number_retries is not None:
+            conn.NumberRetries = self.number_retries
+        return conn
+
+    def reset(self):
+        """Drop the connections made so far. A forked process calls it not
+        to share the sockets of the parent process.
+
+        """
+        self._conn = None
+        self._lock = threading.Lock()
+
+
+class ThreadLocalConnectionManager(ConnectionManager):
+    """Connection manager which gives each thread its own connection."""
+
+    def __init__(self, **kwargs):
+        super(ThreadLocalConnectionManager, self).__init__(**kwargs)
+        self._local = threading.local()
+
+    def get_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self.create_connection()
+        return conn
+
+    def reset(self):
+        super(ThreadLocalConnectionManager, self).reset()
+        self._local = threading.local()
+
+
+class ConnectionPool(ConnectionManager):
+    """Connection manager which keeps a bounded pool of connections.
+    A connection is checked out for each request and returned after it,
+    so that the keep-alive HTTP connections are reused across threads.
+
+    :param size: the maximum number of the connections.
+    :type size: :class:`int`
+    :param timeout: seconds to wait for a connection to be returned when
+                    all of them are checked out. Waits forever if `None`.
+    :type timeout: :class:`numbers.Real`
+
+    """
+
+    def __init__(self, size=10, timeout=None, **kwargs):
+        super(ConnectionPool, self).__init__(**kwargs)
+        self.size = size
+        self.timeout = timeout
+        self._idle = Queue(size)
+        self._created = 0
+
+    def get_connection(self):
+        return PooledConnection(self)
+
+    def reset(self):
+        super(ConnectionPool, self).reset()
+        self._idle = Queue(self.size)
+        self._created = 0
+
+    @contextmanager
+    def checkout(self):
+        """Check out a connection during the context."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self.create_connection()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except Empty:
+            raise ConnectionPoolTimeoutException(
+                'No connection is returned to the pool in {0} seconds'.format(
+                    self.timeout))
+
+
+class PooledConnection(object):
+    """Proxy of :class:`boto.dynamodb2.layer1.DynamoDBConnection` which
+    checks out a connection from the :class:`ConnectionPool` for each call.
+
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __getattr__(self, name):
+        if not callable(getattr(DynamoDBConnection, name, None)):
+            with self._pool.checkout() as conn:
+                return getattr(conn, name)
+
+        def call(*args, **kwargs):
+            with self._pool.checkout() as conn:
+                return getattr(conn, name)(*args, **kwargs)
+        return call
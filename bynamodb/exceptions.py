@@ -11,3 +11,30 @@ class ItemNotFoundException(Exception):
 class ConditionNotRecognizedException(Exception):
     """Raised when the condition is not found"""
     pass
+
+
+class SegmentScanException(Exception):
+    """Raised when some segments of the parallel scan are failed"""
+
+    def __init__(self, failures):
+        super(SegmentScanException, self).__init__(
+            'Segments {0} are failed'.format(sorted(failures)))
+        #: (:class:`dict`) The failed segment number to the tuple of
+        #: the last evaluated key and the raised exception.
+        self.failures = failures
+
+
+class ConnectionPoolTimeoutException(Exception):
+    """Raised when no connection of the pool is available in time"""
+    pass
+
+
+class PartialItemException(Exception):
+    """Raised when the item partially loaded by the projection is written
+    as a whole"""
+    pass
+
+
+class WorkerProcessException(Exception):
+    """Raised when the worker process of the pipeline exits unexpectedly"""
+    pass
@@ -0,0 +1,44 @@
+import threading
+from multiprocessing.pool import ThreadPool
+
+
+class Executor(object):
+    """Thread pool running the model operations in background, used by the
+    non-blocking methods of :class:`~bynamodb.model.Model` such as
+    :meth:`~bynamodb.model.Model.aget_item`.
+
+    Pair it with :class:`~bynamodb.connection.ConnectionPool` of at least
+    the same size, so that the workers do not share a connection.
+
+    :param workers: the number of the worker threads.
+    :type workers: :class:`int`
+
+    """
+
+    def __init__(self, workers=10):
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        """Run the function in a worker thread.
+
+        :returns: :class:`multiprocessing.pool.AsyncResult`
+
+        """
+        return self._get_pool().apply_async(func, args, kwargs)
+
+    def shutdown(self):
+        """Wait for the submitted calls and stop the worker threads."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPool(self.workers)
+        return self._pool
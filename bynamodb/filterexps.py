@@ -5,14 +5,22 @@ class Operator(object):
     """Abstract operators used in the filter expression.
 
     """
-    def build_exp(self):
+    def build_exp(self, attr_values=None, attr_names=None):
         """Generate the filter expression string and the attribute values
         used in :class:`boto.dynamodb2.layer1.DynamoDBConnection`.
+
+        :param attr_values: the placeholders of the values shared with
+                            the other expressions of the request.
+        :type attr_values: :class:`AttributeValues`
+        :param attr_names: the placeholders of the names. If given, the
+                           attribute names are replaced with them.
+        :type attr_names: :class:`AttributeNames`
         """
-        attr_values = AttributeValues()
-        return self._build_exp(attr_values), attr_values.data
+        if attr_values is None:
+            attr_values = AttributeValues()
+        return self._build_exp(attr_values, attr_names), attr_values.data
 
-    def _build_exp(self, attr_values):
+    def _build_exp(self, attr_values, attr_names=None):
         raise NotImplemented
 
     def __and__(self, operator):
@@ -30,14 +38,54 @@ class AttributeValues(object):
         self._dynamizer = Dynamizer()
         self._current_key = 1
 
-    def insert(self, value):
+    def insert(self, value, attribute=None):
+        """Allocate the placeholder of the value.
+
+        :param attribute: the attribute encoding the value. If omitted,
+                          the type of the value is inferred.
+        :type attribute: :class:`~bynamodb.attributes.Attribute`
+
+        """
         key = ':' + str(self._current_key)
-        attr_value = self._dynamizer.encode(value)
+        if attribute is None:
+            attr_value = self._dynamizer.encode(value)
+        else:
+            attr_value = attribute.encode(value)
         self.data[key] = attr_value
         self._current_key += 1
         return key
 
 
+class AttributeNames(object):
+    """Placeholders of the attribute names, so that the names are not
+    confused with the reserved words of the expressions.
+
+    """
+
+    def __init__(self):
+        self.data = {}
+        self._placeholders = {}
+
+    def insert(self, name):
+        placeholder = self._placeholders.get(name)
+        if placeholder is None:
+            placeholder = '#' + str(len(self._placeholders) + 1)
+            self._placeholders[name] = placeholder
+            self.data[placeholder] = name
+        return placeholder
+
+    def insert_path(self, path):
+        """Replace the names of the document path such as ``a.b[0].c``
+        with their placeholders.
+
+        """
+        elements = []
+        for element in path.split('.'):
+            name, bracket, index = element.partition('[')
+            elements.append(self.insert(name) + bracket + index)
+        return '.'.join(elements)
+
+
 class LogicalOperator(Operator):
     operator = None
 
@@ -45,11 +93,11 @@ class LogicalOperator(Operator):
         self.op1 = op1
         self.op2 = op2
 
-    def _build_exp(self, attr_values):
+    def _build_exp(self, attr_values, attr_names=None):
         return '({0} {1} {2})'.format(
-            self.op1._build_exp(attr_values),
+            self.op1._build_exp(attr_values, attr_names),
             self.operator,
-            self.op2._build_exp(attr_values)
+            self.op2._build_exp(attr_values, attr_names)
         )
 
 
@@ -68,10 +116,10 @@ class ComparisonOperator(Operator):
         self.attr_name = attr_name
         self.comparator = comparator
 
-    def _build_exp(self, attr_values):
+    def _build_exp(self, attr_values, attr_names=None):
         key = attr_values.insert(self.comparator)
         return '{0} {1} {2}'.format(
-            self.attr_name, self.operator, key
+            _build_path(self.attr_name, attr_names), self.operator, key
         )
 
 
@@ -104,6 +152,28 @@ class Contains(Operator):
         self.path = path
         self.operand = operand
 
-    def _build_exp(self, attr_values):
+    def _build_exp(self, attr_values, attr_names=None):
         key = attr_values.insert(self.operand)
-        return 'contains({0}, {1})'.format(self.path, key)
+        return 'contains({0}, {1})'.format(
+            _build_path(self.path, attr_names), key)
+
+
+class AttributeExists(Operator):
+    function = 'attribute_exists'
+
+    def __init__(self, path):
+        self.path = path
+
+    def _build_exp(self, attr_values, attr_names=None):
+        return '{0}({1})'.format(self.function,
+                                 _build_path(self.path, attr_names))
+
+
+class AttributeNotExists(AttributeExists):
+    function = 'attribute_not_exists'
+
+
+def _build_path(path, attr_names):
+    if attr_names is None:
+        return path
+    return attr_names.insert_path(path)
@@ -0,0 +1,233 @@
+"""Instrumentation hooks of the requests of the models.
+
+The callbacks registered by :func:`add_before_request` and
+:func:`add_after_request` are called with a :class:`RequestEvent` for every
+request sent by the models, including each page of
+:class:`~bynamodb.results.ResultSet` and each batch of
+:class:`~bynamodb.model.BatchWrite`. After the items of a response are
+decoded, the after callbacks are called again with a ``'decode'`` event.
+
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+
+
+_before_request = []
+_after_request = []
+
+
+def add_before_request(callback):
+    """Register the callback called with the :class:`RequestEvent`
+    before each request.
+
+    """
+    _before_request.append(callback)
+
+
+def add_after_request(callback):
+    """Register the callback called with the :class:`RequestEvent`
+    after each request and each decoding of the items.
+
+    """
+    _after_request.append(callback)
+
+
+def remove_before_request(callback):
+    _before_request.remove(callback)
+
+
+def remove_after_request(callback):
+    _after_request.remove(callback)
+
+
+def active():
+    """`True` if any callback is registered. The events are not built
+    otherwise.
+
+    """
+    return bool(_before_request or _after_request)
+
+
+class RequestEvent(object):
+    """Information of a request or a decoding of the items."""
+
+    def __init__(self, kind, operation, table_name, index_name=None):
+        #: (:class:`str`) ``'request'`` or ``'decode'``.
+        self.kind = kind
+
+        #: (:class:`str`) The operation name such as ``'query'``.
+        self.operation = operation
+
+        #: (:class:`str`) The table name. Comma separated for the batch
+        #: operations over multiple tables.
+        self.table_name = table_name
+
+        #: (:class:`str`) The index name of the query or scan.
+        self.index_name = index_name
+
+        #: (:class:`float`) Seconds taken by the request.
+        self.latency = None
+
+        #: (:class:`int`) Approximate size in bytes of the JSON request body.
+        self.request_size = None
+
+        #: (:class:`int`) Approximate size in bytes of the JSON response body.
+        self.response_size = None
+
+        #: (:class:`int`) The number of the items returned or decoded.
+        self.items = 0
+
+        #: (:class:`int`) The number of the retries of the request.
+        self.retries = 0
+
+        #: (:class:`float`) Seconds taken by decoding the items.
+        self.decode_time = None
+
+        #: (:class:`Exception`) The error raised by the request, if any.
+        self.error = None
+
+
+def request(operation, func, args, kwargs, retry_policy=None):
+    """Call the request function, emitting the :class:`RequestEvent`."""
+    table_name = _get_table_name(operation, args)
+    event = RequestEvent('request', operation, table_name,
+                         kwargs.get('index_name'))
+    event.request_size = len(json.dumps([args, kwargs], default=repr))
+    for callback in list(_before_request):
+        callback(event)
+    started = time.time()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        event.error = e
+        raise
+    else:
+        if result:
+            event.response_size = len(json.dumps(result))
+            event.items = _count_items(result)
+    finally:
+        event.latency = time.time() - started
+        if retry_policy is not None:
+            event.retries = retry_policy.last_retries
+        for callback in list(_after_request):
+            callback(event)
+    return result
+
+
+def decode(model, operation, items_raw, attributes=None, index_name=None):
+    """Decode the raw items with :meth:`~bynamodb.model.Model.from_raw_data`
+    lazily, emitting the ``'decode'`` event after all of them are decoded.
+
+    """
+    if not active():
+        for item_raw in items_raw:
+            yield model.from_raw_data(item_raw, attributes)
+        return
+    event = RequestEvent('decode', operation, model.get_table_name(),
+                         index_name)
+    event.decode_time = 0.0
+    for item_raw in items_raw:
+        started = time.time()
+        item = model.from_raw_data(item_raw, attributes)
+        event.decode_time += time.time() - started
+        event.items += 1
+        yield item
+    for callback in list(_after_request):
+        callback(event)
+
+
+def _get_table_name(operation, args):
+    if operation.startswith('batch_'):
+        return ','.join(sorted(args[0]))
+    if operation.startswith('transact_'):
+        # The arguments are the action and the JSON body of the request.
+        items = json.loads(args[1])['TransactItems']
+        return ','.join(sorted(set(
+            request['TableName'] for item in items
+            for request in item.values())))
+    return args[0] if args else None
+
+
+def _count_items(result):
+    if 'Items' in result:
+        return len(result['Items'])
+    if 'Item' in result:
+        return 1
+    if 'Responses' in result:
+        return sum(len(items) for items in result['Responses'].values())
+    return 0
+
+
+class Histogram(object):
+    """Cumulative histogram of the observed values."""
+
+    #: (:class:`tuple`) The upper bounds of the buckets.
+    buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        #: (:class:`list`) The number of the values in each bucket and
+        #: below. The last one is the number of all values.
+        self.counts = [0] * (len(self.buckets) + 1)
+
+        #: (:class:`float`) The sum of the values.
+        self.sum = 0.0
+
+    @property
+    def count(self):
+        return self.counts[-1]
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.counts[-1] += 1
+        self.sum += value
+
+
+class HistogramCollector(object):
+    """Callback of :func:`add_after_request` collecting the histograms of
+    the latency and the decode time, and the counters of the bytes, items,
+    retries and errors per operation, table and index.
+
+    .. code-block:: python
+
+        collector = HistogramCollector()
+        add_after_request(collector)
+
+    """
+
+    def __init__(self):
+        #: (:class:`dict`) The tuple of the operation name, the table name
+        #: and the index name to the :class:`Histogram` of the latency.
+        self.latency = defaultdict(Histogram)
+
+        #: (:class:`dict`) The key to the :class:`Histogram` of
+        #: the decode time.
+        self.decode_time = defaultdict(Histogram)
+
+        #: (:class:`dict`) The key to :class:`dict` of the counter name to
+        #: the count. The counters are ``'requests'``, ``'request_bytes'``,
+        #: ``'response_bytes'``, ``'items'``, ``'decoded_items'``,
+        #: ``'retries'`` and ``'errors'``.
+        self.counters = defaultdict(lambda: defaultdict(int))
+
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        key = (event.operation, event.table_name, event.index_name)
+        with self._lock:
+            counters = self.counters[key]
+            if event.kind == 'decode':
+                self.decode_time[key].observe(event.decode_time)
+                counters['decoded_items'] += event.items
+                return
+            self.latency[key].observe(event.latency)
+            counters['requests'] += 1
+            counters['request_bytes'] += event.request_size or 0
+            counters['response_bytes'] += event.response_size or 0
+            counters['items'] += event.items
+            counters['retries'] += event.retries
+            if event.error is not None:
+                counters['errors'] += 1
@@ -1,19 +1,38 @@
 import copy
+import json
+import time
+import uuid
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
-from boto.dynamodb2.layer1 import DynamoDBConnection
 from boto.dynamodb2.fields import HashKey, RangeKey
 from boto.dynamodb2.types import Dynamizer
 
-from .attributes import Attribute
+from . import hooks
+from .attributes import Attribute, SetAttribute, VersionAttribute
+from .capacity import capacity_units, record as record_capacity
 from .conditions import KEY_CONDITIONS, build_condition
-from .exceptions import NullAttributeException, ItemNotFoundException
+from .connection import ConnectionManager
+from .exceptions import (NullAttributeException, ItemNotFoundException,
+                         PartialItemException)
+from .executor import Executor
+from .filterexps import (AttributeNames, AttributeNotExists, AttributeValues,
+                         EQ)
 from .indexes import Index, GlobalIndex
-from .results import ResultSet
+from .results import ResultSet, SegmentedResultSet, decode_token
+from .retry import RateLimiter, RetryingConnection, backoff_delay
+from .storage import make_compact_data
+from .updateexps import Add, Remove, Set, Update
 
 
 class ModelMeta(type):
     """Model meta class"""
     def __new__(mcs, clsname, bases, dct):
+        compact = dct.get(
+            'compact', any(getattr(base, 'compact', False) for base in bases))
+        if compact:
+            # Items of the compact model have no instance dictionary.
+            dct.setdefault('__slots__', ())
         for name, val in dct.items():
             if isinstance(val, Attribute):
                 val.attr_name = name
@@ -22,7 +41,28 @@ class ModelMeta(type):
                 if val.range_key:
                     val._keys.append(RangeKey(val.range_key,
                                               dct[val.range_key].type))
-        return super(ModelMeta, mcs).__new__(mcs, clsname, bases, dct)
+        cls = super(ModelMeta, mcs).__new__(mcs, clsname, bases, dct)
+
+        # Compile the decoding plan of the model once, so that
+        # :meth:`Model.from_raw_data` does not look up the attributes
+        # for every item.
+        cls._attributes = None
+        attributes = cls._get_attributes()
+        cls._decoders = dict(
+            (name, attr.decode) for name, attr in attributes.items())
+        cls._defaults = [(name, attr.default)
+                         for name, attr in attributes.items()
+                         if attr.default is not None]
+        cls._encoders = [(name, attr.null, attr)
+                         for name, attr in attributes.items()]
+        cls._version_attribute = next(
+            (name for name, attr in attributes.items()
+             if isinstance(attr, VersionAttribute)), None)
+        if compact:
+            cls._data_class = make_compact_data(clsname + 'Data', attributes)
+        else:
+            cls._data_class = dict
+        return cls
 
 
 class Model(object):
@@ -34,21 +74,89 @@ class Model(object):
     """
     __metaclass__ = ModelMeta
 
+    # The state of the item:
+    # - `_data`: the attribute values.
+    # - `_raw`: (:class:`dict`) The raw values of the attributes not decoded
+    #   yet. `None` unless decoded lazily.
+    # - `_loaded`: (:class:`frozenset`) The names of the loaded attributes
+    #   if the item is partially loaded by the projection.
+    #   `None` if fully loaded.
+    # - `_dirty`: (:class:`set`) The names of the attributes modified since
+    #   the item is loaded from or saved to the table. `None` if the item is
+    #   not persisted, so that it is saved as a whole.
+    # - `_snapshots`: (:class:`dict`) The copies of the mutable values taken
+    #   when they are first read, to detect the changes made in place.
+    #   `None` if no mutable value is read.
+    __slots__ = ('_data', '_raw', '_loaded', '_dirty', '_snapshots')
+
     #: (:class:`str`) The table name.
     #: # If omitted, the Model class name will be the table name.
     table_name = None
 
+    #: (:class:`str`) `ReturnConsumedCapacity` of the requests, ``'TOTAL'`` or
+    #: ``'INDEXES'``. If set, the consumed capacity is reported to the
+    #: listeners of :mod:`bynamodb.capacity`. Not requested if `None`.
+    return_consumed_capacity = None
+
+    #: (:class:`~bynamodb.cache.Cache`) The read-through cache of the items.
+    #: If set, :meth:`get_item` and :meth:`batch_get` read the items from
+    #: the cache, and the writes of this process update it.
+    cache = None
+
     #: (:class:`str`) The prefix of table name.
     #: If not empty string and the model does not have defined table name,
     #: the table name would consists of the prefix and the class name
     #: of the model.
     _table_prefix = ''
 
+    #: (:class:`~bynamodb.connection.ConnectionManager`) The manager
+    #: providing the connection, shared by all models.
+    _connection_manager = ConnectionManager()
+
+    #: (:class:`~bynamodb.retry.RetryPolicy`) The retry policy of
+    #: the requests, shared by all models. Not retried if `None`.
+    _retry_policy = None
+
+    #: (:class:`~bynamodb.executor.Executor`) The thread pool running
+    #: the non-blocking operations, shared by all models.
+    _executor = Executor()
+
     _attributes = None
-    _conn = None
     _keys = None
     _indexes = None
 
+    # (:class:`dict`) The attribute name to the decode function.
+    # It is compiled by the meta class.
+    _decoders = None
+
+    # (:class:`list`) The pairs of the attribute name and the default value.
+    # It is compiled by the meta class.
+    _defaults = None
+
+    # (:class:`list`) The tuples of the attribute name, nullability and
+    # the attribute. It is compiled by the meta class.
+    _encoders = None
+
+    # (:class:`str`) The name of the
+    # :class:`~bynamodb.attributes.VersionAttribute`. It is found by
+    # the meta class.
+    _version_attribute = None
+
+    #: (:class:`bool`) If `True`, the items from the table keep the raw
+    #: values and decode each attribute on its first access. The untouched
+    #: raw values are written back as they are.
+    lazy_decode = False
+
+    #: (:class:`bool`) If `True`, the items of the model have no instance
+    #: dictionary, and store the attribute values in a fixed-layout
+    #: :class:`~bynamodb.storage.CompactData` instead of a :class:`dict`.
+    #: It reduces the memory of large result sets. Items of a compact model
+    #: cannot have instance attributes other than the model attributes.
+    compact = False
+
+    # The class of `_data`. It is chosen by the meta class.
+    _data_class = dict
+
     def __init__(self, **data):
         """An object of the Model represents an item of the model.
 
@@ -56,48 +164,218 @@ class Model(object):
         :type data: :class:`collections.Mapping`
 
         """
-        self._data = {}
+        self._data = self._data_class()
+        self._raw = None
+        self._loaded = None
+        self._reset_dirty(persisted=False)
         self._set_defaults()
+        attributes = self._get_attributes()
         for name, value in data.items():
-            if name in dir(self):
+            if name in attributes:
                 setattr(self, name, value)
-            else:
-                continue
+
+    def __getstate__(self):
+        # The values are pickled as a plain dict, since the compact data
+        # classes are generated for each model.
+        return (dict(self._data.items()), self._raw, self._loaded,
+                self._dirty, self._snapshots)
+
+    def __setstate__(self, state):
+        (values, self._raw, self._loaded, self._dirty,
+         self._snapshots) = state
+        self._data = data = self._data_class()
+        for name, value in values.items():
+            data[name] = value
 
     def _set_defaults(self):
-        for attr in self._get_attributes().values():
-            if attr.default is not None:
-                value = copy.copy(attr.default)
-                if callable(value):
-                    value = value()
-                setattr(self, attr.attr_name, value)
+        data = self._data
+        raw = self._raw or {}
+        loaded = self._loaded
+        for name, default in self._defaults:
+            if name in data or name in raw:
+                continue
+            if loaded is None or name in loaded:
+                data[name] = _make_default(default)
 
     def serialize(self):
         data = {}
-        for name, attr in self._get_attributes().items():
-            attr_value = getattr(self, name, None)
+        values = self._data
+        raw = self._raw or {}
+        for name, _, attr in self._encoders:
+            if name in raw:
+                data[name] = raw[name]
+                continue
+            attr_value = values.get(name)
             if attr_value is None:
                 continue
-            data[attr.attr_name] = attr.encode(attr_value)
+            data[name] = attr.encode(attr_value)
         return data
 
     def validate(self):
-        for name, attr in self._get_attributes().items():
-            attr_value = getattr(self, name, None)
+        values = self._data
+        raw = self._raw or {}
+        for name, null, _ in self._encoders:
+            if name in raw:
+                continue
+            if not values.get(name) and not null:
+                raise NullAttributeException(
+                    'Attribute {0} cannot be null'.format(name))
+
+    def _serialize(self):
+        """Validate and serialize the item in a single pass.
+
+        :exc:`~bynamodb.exceptions.NullAttributeException` takes precedence
+        over :exc:`ValueError` of invalid values, as :meth:`validate`
+        runs before :meth:`serialize`. The raw values not decoded yet are
+        passed through.
+
+        """
+        data = {}
+        values = self._data
+        raw = self._raw or {}
+        invalid = None
+        for name, null, attr in self._encoders:
+            if name in raw:
+                data[name] = raw[name]
+                continue
+            attr_value = values.get(name)
+            if not attr_value:
+                if not null:
+                    raise NullAttributeException(
+                        'Attribute {0} cannot be null'.format(name))
+                if attr_value is None:
+                    continue
+            if not attr.valid(attr_value):
+                if invalid is None:
+                    invalid = attr.get_invalidation_message(attr_value)
+                continue
+            data[name] = attr._encode(attr_value)
+        if invalid is not None:
+            raise ValueError(invalid)
+        return data
+
+    def is_loaded(self, name):
+        """`False` if the attribute is not loaded because the item is
+        fetched with the projection excluding it.
+
+        """
+        return self._loaded is None or name in self._loaded
+
+    def is_dirty(self, name=None):
+        """`True` if the attribute, or any attribute if `name` is omitted,
+        is modified since the item is loaded from or saved to the table.
+        Always `True` for the item not persisted yet.
+
+        """
+        dirty = self._get_dirty()
+        if dirty is None:
+            return True
+        if name is None:
+            return bool(dirty)
+        return name in dirty
+
+    def _get_dirty(self):
+        """The names of the modified attributes, including the mutable
+        values changed in place since they are read.
+
+        """
+        dirty = self._dirty
+        if dirty is None or not self._snapshots:
+            return dirty
+        values = self._data
+        changed = [name for name, snapshot in self._snapshots.items()
+                   if name not in dirty and values.get(name) != snapshot]
+        return dirty.union(changed) if changed else dirty
+
+    def _reset_dirty(self, persisted=True):
+        """Forget the modifications once the item is saved to, or deleted
+        from the table.
+
+        """
+        self._dirty = set() if persisted else None
+        self._snapshots = None
+
+    def save(self, condition_builder=None):
+        """Save the item to the table.
+
+        The item loaded from the table is saved by updating the modified
+        attributes only, and not requested at all if nothing is modified.
+        The new item, or the item whose keys are modified, is put as a whole.
+
+        :param condition_builder: the condition of the write. If it is not
+                                  met, :exc:`boto.dynamodb2.exceptions.
+                                  ConditionalCheckFailedException` is raised.
+        :type condition_builder: :class:`~bynamodb.filterexps.Operator`
+
+        """
+        dirty = self._get_dirty()
+        if dirty is None or any(key.name in dirty
+                                for key in self._get_keys()):
+            self._put_item(self, condition_builder)
+        elif dirty:
+            self._update_dirty(dirty, condition_builder)
+
+    def _update_dirty(self, dirty, condition_builder=None):
+        """Update the modified attributes with SET and REMOVE actions."""
+        attributes = self._get_attributes()
+        values = self._data
+        version = self._version_attribute
+        actions = []
+        for name in sorted(dirty):
+            if name == version:
+                continue
+            attr = attributes[name]
+            attr_value = values.get(name)
             if not attr_value:
                 if not attr.null:
                     raise NullAttributeException(
                         'Attribute {0} cannot be null'.format(name))
-                else:
+                # DynamoDB does not store the empty set.
+                if attr_value is None or isinstance(attr, SetAttribute):
+                    actions.append(Remove(name))
                     continue
+            actions.append(Set(name, attr_value))
+        if version is not None:
+            current = getattr(self, version)
+            actions.append(Set(version, (current or 0) + 1))
+            condition_builder = self._version_condition(current,
+                                                        condition_builder)
+        key = self._get_encoded_key()
+        self._update_item(key, Update(*actions), condition_builder)
+        if version is not None:
+            values[version] = (current or 0) + 1
+        self._reset_dirty()
 
-    def save(self):
-        self._put_item(self)
+    def _get_encoded_key(self):
+        """Encode the key of the item. The key values are read through
+        the attributes, as they may not be decoded yet.
 
-    def delete(self):
-        key_fields = [key.name for key in self._get_keys()]
-        key = self._encode_key(*[getattr(self, key) for key in key_fields])
-        return self._get_connection().delete_item(self.get_table_name(), key)
+        """
+        return self._encode_key(*[getattr(self, key.name)
+                                  for key in self._get_keys()])
+
+    def delete(self, condition_builder=None):
+        """Delete the item from the table.
+
+        :param condition_builder: the condition of the write. If it is not
+                                  met, :exc:`boto.dynamodb2.exceptions.
+                                  ConditionalCheckFailedException` is raised.
+        :type condition_builder: :class:`~bynamodb.filterexps.Operator`
+
+        """
+        key = self._get_encoded_key()
+        version = self._version_attribute
+        if version is not None:
+            condition_builder = self._version_condition(
+                getattr(self, version), condition_builder)
+        delete_kwargs = {}
+        self._build_write_expressions(delete_kwargs,
+                                      condition_builder=condition_builder)
+        result = self._request('delete_item', self.get_table_name(), key,
+                               **delete_kwargs)
+        self._cache_evict(key)
+        self._reset_dirty(persisted=False)
+        return result
 
     @classmethod
     def create_table(cls, read_throughput=5, write_throughput=5):
@@ -139,80 +417,163 @@ class Model(object):
         )
 
     @classmethod
-    def put_item(cls, **data):
+    def put_item(cls, condition_builder=None, **data):
         """Put item to the table.
 
         :param data: key value of the item.
         :type data: :class:`collections.Mapping`
+        :param condition_builder: the condition of the write. If it is not
+                                  met, :exc:`boto.dynamodb2.exceptions.
+                                  ConditionalCheckFailedException` is raised.
+        :type condition_builder: :class:`~bynamodb.filterexps.Operator`
 
         """
-        return cls._put_item(cls(**data))
+        return cls._put_item(cls(**data), condition_builder)
 
     @classmethod
-    def _put_item(cls, item):
-        item.validate()
-        cls._get_connection().put_item(cls.get_table_name(), item.serialize())
+    def _put_item(cls, item, condition_builder=None):
+        if item._loaded is not None:
+            raise PartialItemException(
+                'The item loaded with the projection cannot be put')
+        version = cls._version_attribute
+        if version is not None:
+            current = getattr(item, version)
+            condition_builder = cls._version_condition(current,
+                                                       condition_builder)
+            item._data[version] = (current or 0) + 1
+        try:
+            serialized = item._serialize()
+            put_kwargs = {}
+            cls._build_write_expressions(put_kwargs,
+                                         condition_builder=condition_builder)
+            cls._request('put_item', cls.get_table_name(), serialized,
+                         **put_kwargs)
+        except Exception:
+            if version is not None:
+                item._data[version] = current
+            raise
+        cls._cache_store(serialized)
+        item._reset_dirty()
         return item
 
     @classmethod
-    def get_item(cls, hash_key, range_key=None):
-        """ Get item from the table."""
+    def get_item(cls, hash_key, range_key=None, attributes=None):
+        """ Get item from the table.
+
+        :param attributes: the names of the attributes to fetch. If given,
+                           the item is partially loaded with the attributes
+                           and the keys.
+        :type attributes: :class:`collections.Iterable`
+
+        """
         key = cls._encode_key(hash_key, range_key)
-        raw_data = cls._get_connection().get_item(cls.get_table_name(), key)
-        if 'Item' not in raw_data:
-            raise ItemNotFoundException
-        return cls.from_raw_data(raw_data['Item'])
+        get_kwargs = {}
+        if attributes:
+            attributes = cls._build_projection(attributes, get_kwargs)
+        item_raw = None
+        if cls.cache is not None:
+            item_raw = cls.cache.get(cls._cache_key(key))
+        if item_raw is None:
+            raw_data = cls._request('get_item', cls.get_table_name(), key,
+                                    **get_kwargs)
+            if 'Item' not in raw_data:
+                raise ItemNotFoundException
+            item_raw = raw_data['Item']
+            if not attributes:
+                cls._cache_store(item_raw)
+        # The generator is run to the end to emit the decode event.
+        return list(hooks.decode(cls, 'get_item', [item_raw], attributes))[0]
 
     @classmethod
-    def update_item(cls, hash_key, range_key=None, attributes_to_set=None, attributes_to_add=None):
-        """Update item attributes. Currently SET and ADD actions are supported."""
+    def update_item(cls, hash_key, range_key=None, attributes_to_set=None,
+                    attributes_to_add=None, update_builder=None,
+                    condition_builder=None, return_values=None):
+        """Update item attributes.
+
+        :param attributes_to_set: the attribute name to the value to set.
+        :type attributes_to_set: :class:`collections.Mapping`
+        :param attributes_to_add: the attribute name to the number to add,
+                                  or the elements to add to the set.
+        :type attributes_to_add: :class:`collections.Mapping`
+        :param update_builder: update expression builder.
+        :type update_builder: :class:`~bynamodb.updateexps.Action`
+        :param condition_builder: the condition of the write. If it is not
+                                  met, :exc:`boto.dynamodb2.exceptions.
+                                  ConditionalCheckFailedException` is raised.
+        :type condition_builder: :class:`~bynamodb.filterexps.Operator`
+        :param return_values: `ReturnValues` of the request, ``'ALL_NEW'``,
+                              ``'UPDATED_NEW'``, ``'ALL_OLD'`` or
+                              ``'UPDATED_OLD'``.
+        :type return_values: :class:`str`
+        :returns: the item of the returned attributes if `return_values` is
+                  given. It is partially loaded with the updated attributes
+                  unless all attributes are returned.
+
+        The :class:`~bynamodb.attributes.VersionAttribute` of the model is
+        incremented without being checked.
+
+        """
         primary_key = cls._encode_key(hash_key, range_key)
+        actions = []
+        for name, value in (attributes_to_set or {}).items():
+            actions.append(Set(name, value))
+        for name, value in (attributes_to_add or {}).items():
+            actions.append(Add(name, value))
+        if update_builder:
+            actions.append(update_builder)
+        if cls._version_attribute is not None:
+            actions.append(Add(cls._version_attribute, 1))
+        return cls._update_item(primary_key, Update(*actions),
+                                condition_builder, return_values)
 
-        value_names = {}
-        encoded_values = {}
-        dynamizer = Dynamizer()
+    @classmethod
+    def _update_item(cls, primary_key, update_builder, condition_builder=None,
+                     return_values=None):
+        update_kwargs = {}
+        cls._build_write_expressions(update_kwargs, update_builder,
+                                     condition_builder)
+        if return_values:
+            update_kwargs['return_values'] = return_values
 
-        set_expression = ''
-        if attributes_to_set:
-            for i, key in enumerate(attributes_to_set.keys()):
-                value_name = ':s{0}'.format(i)
-                value_names[key] = value_name
-                encoded_values[value_name] = dynamizer.encode(attributes_to_set[key])
-
-            set_expression = 'SET {0}'.format(
-                ', '.join(
-                    '{key}={value_name}'.format(key=key, value_name=value_names[key]) for key in attributes_to_set
-                )
-            )
-
-        add_expression = ''
-        if attributes_to_add:
-            for i, key in enumerate(attributes_to_add.keys()):
-                value_name = ':a{0}'.format(i)
-                value_names[key] = value_name
-                encoded_values[value_name] = dynamizer.encode(attributes_to_add[key])
-            add_expression = 'ADD {0}'.format(
-                ', '.join(
-                    '{key} {value_name}'.format(key=key, value_name=value_names[key]) for key in attributes_to_add
-                )
-            )
-
-        update_expression = ' '.join([set_expression, add_expression])
-
-        cls._get_connection().update_item(
-            cls.get_table_name(),
-            primary_key,
-            update_expression=update_expression, expression_attribute_values=encoded_values)
+        result = cls._request('update_item', cls.get_table_name(),
+                              primary_key, **update_kwargs)
+        cls._cache_evict(primary_key)
+        if not return_values or not result or 'Attributes' not in result:
+            return None
+        attributes = result['Attributes']
+        return cls.from_raw_data(
+            attributes,
+            None if return_values.startswith('ALL_') else attributes)
 
     @classmethod
     def query(cls, index_name=None, filter_builder=None,
-              scan_index_forward=None, limit=None, **key_conditions):
+              scan_index_forward=None, limit=None, prefetch=0,
+              attributes=None, start_token=None, checkpoint=None,
+              checkpoint_every=1, page_size=None, **key_conditions):
         """High level query API.
 
         :param key_filter: key conditions of the query.
         :type key_filter: :class:`collections.Mapping`
         :param filter_builder: filter expression builder.
         :type filter_builder: :class:`~bynamodb.filterexps.Operator`
+        :param prefetch: the number of the pages fetched ahead in background
+                         while iterating the result.
+        :type prefetch: :class:`int`
+        :param attributes: the names of the attributes to fetch. If given,
+                           the items are partially loaded with the attributes
+                           and the keys.
+        :type attributes: :class:`collections.Iterable`
+        :param start_token: the :attr:`~bynamodb.results.ResultSet.token`
+                            of an interrupted result to resume from.
+        :type start_token: :class:`str`
+        :param checkpoint: the function called with the token of the result
+                           every `checkpoint_every` pages consumed.
+        :type checkpoint: :class:`collections.Callable`
+        :param checkpoint_every: the number of pages between checkpoints.
+        :type checkpoint_every: :class:`int`
+        :param page_size: the maximum number of the items per request,
+                          independent of the total `limit`.
+        :type page_size: :class:`int`
         """
         query_kwargs = {
             'key_conditions': build_condition(key_conditions, KEY_CONDITIONS),
@@ -222,64 +583,368 @@ class Model(object):
         }
         if filter_builder:
             cls._build_filter_expression(filter_builder, query_kwargs)
-        return ResultSet(cls, 'query', query_kwargs)
+        if attributes:
+            attributes = cls._build_projection(attributes, query_kwargs)
+        if start_token:
+            query_kwargs['exclusive_start_key'] = decode_token(start_token)
+        return ResultSet(cls, 'query', query_kwargs, prefetch=prefetch,
+                         attributes=attributes, checkpoint=checkpoint,
+                         checkpoint_every=checkpoint_every,
+                         page_size=page_size)
 
     @classmethod
-    def scan(cls, filter_builder=None, **scan_filter):
+    def scan(cls, filter_builder=None, segment=None, total_segments=None,
+             workers=None, ordered=False, prefetch=0, attributes=None,
+             start_token=None, checkpoint=None, checkpoint_every=1,
+             limit=None, page_size=None, **scan_filter):
         """High level scan API.
 
         :param filter_builder: filter expression builder.
         :type filter_builder: :class:`~bynamodb.filterexps.Operator`
+        :param segment: the segment to scan. If given, only the segment
+                        is scanned out of `total_segments` segments.
+        :type segment: :class:`int`
+        :param total_segments: the number of segments of the parallel scan.
+                               If given without `segment`, all segments are
+                               scanned in parallel and merged.
+        :type total_segments: :class:`int`
+        :param workers: the number of the threads of the parallel scan.
+                        Defaults to `total_segments`.
+        :type workers: :class:`int`
+        :param ordered: yield the items of the parallel scan segment by
+                        segment, instead of as soon as they arrive.
+        :type ordered: :class:`bool`
+        :param prefetch: the number of the pages fetched ahead in background
+                         while iterating the result. The parallel scan
+                         always buffers pages per worker.
+        :type prefetch: :class:`int`
+        :param attributes: the names of the attributes to fetch. If given,
+                           the items are partially loaded with the attributes
+                           and the keys.
+        :type attributes: :class:`collections.Iterable`
+        :param start_token: the :attr:`~bynamodb.results.ResultSet.token`
+                            of an interrupted result to resume from.
+        :type start_token: :class:`str`
+        :param checkpoint: the function called with the token of the result
+                           every `checkpoint_every` pages consumed.
+                           The parallel scan resumes per segment with
+                           :meth:`~bynamodb.results.SegmentedResultSet.resume`
+                           instead.
+        :type checkpoint: :class:`collections.Callable`
+        :param checkpoint_every: the number of pages between checkpoints.
+        :type checkpoint_every: :class:`int`
+        :param limit: the maximum number of the items to evaluate, per segment
+                      for the parallel scan.
+        :type limit: :class:`int`
+        :param page_size: the maximum number of the items per request,
+                          independent of the total `limit`.
+        :type page_size: :class:`int`
 
         """
-        scan_kwargs = {'scan_filter': build_condition(scan_filter)}
+        scan_kwargs = {'scan_filter': build_condition(scan_filter),
+                       'limit': limit}
         if filter_builder:
             cls._build_filter_expression(filter_builder, scan_kwargs)
-        return ResultSet(cls, 'scan', scan_kwargs)
-
-    @classmethod
-    def batch_get(cls, *args):
-        unprocessed = [cls._encode_key(*key) for key in args]
-        while unprocessed:
-            nexts = unprocessed[:100]
-            unprocessed = unprocessed[100:]
-            request_items = {
-                cls.get_table_name():
-                {
-                    'Keys': nexts
-                }
-            }
-            result = cls._get_connection().batch_get_item(request_items)
-            for item in result['Responses'].get(cls.get_table_name()):
-                yield cls.from_raw_data(item)
-            for i, key in enumerate(
-                    result.get('UnprocessedKeys', {}).get(cls.get_table_name(), {}).get('Keys', [])):
-                unprocessed.insert(i, key)
-        raise StopIteration
-
-    @classmethod
-    def batch_write(cls):
-        return BatchWrite(cls)
-
-    @classmethod
-    def from_raw_data(cls, item_raw):
+        if attributes:
+            attributes = cls._build_projection(attributes, scan_kwargs)
+        if start_token:
+            scan_kwargs['exclusive_start_key'] = decode_token(start_token)
+        if total_segments and segment is None:
+            if start_token or checkpoint:
+                raise ValueError('The parallel scan cannot be resumed from '
+                                 'a token; resume each segment instead.')
+            return SegmentedResultSet(cls, scan_kwargs, total_segments,
+                                      workers=workers, ordered=ordered,
+                                      attributes=attributes,
+                                      page_size=page_size)
+        if segment is not None:
+            scan_kwargs['segment'] = segment
+            scan_kwargs['total_segments'] = total_segments
+        return ResultSet(cls, 'scan', scan_kwargs, prefetch=prefetch,
+                         attributes=attributes, checkpoint=checkpoint,
+                         checkpoint_every=checkpoint_every,
+                         page_size=page_size)
+
+    @classmethod
+    def batch_get(cls, *keys, **options):
+        """Get the items of the keys. Repeated keys are requested once.
+
+        :param keys: the tuples of the hash key and the range key.
+        :param workers: the number of the 100-key requests sent concurrently.
+                        Defaults to 1.
+        :type workers: :class:`int`
+        :param ordered: yield the items in the order of the keys.
+                        Items not found are skipped.
+        :type ordered: :class:`bool`
+        :param attributes: the names of the attributes to fetch. If given,
+                           the items are partially loaded with the attributes
+                           and the keys.
+        :type attributes: :class:`collections.Iterable`
+
+        """
+        workers = options.pop('workers', 1)
+        ordered = options.pop('ordered', False)
+        attributes = options.pop('attributes', None)
+        if options:
+            raise TypeError('batch_get() got an unexpected keyword argument '
+                            '{0!r}'.format(sorted(options)[0]))
+        projection = {}
+        if attributes:
+            attributes = cls._build_projection(attributes, projection)
+
+        encoded = OrderedDict()
+        for key in keys:
+            key = cls._encode_key(*key)
+            encoded.setdefault(_key_signature(key), key)
+
+        cached = {}
+        if cls.cache is not None:
+            for signature, key in encoded.items():
+                item_raw = cls.cache.get(cls._cache_key(key))
+                if item_raw is not None:
+                    cached[signature] = item_raw
+        encoded_keys = [key for signature, key in encoded.items()
+                        if signature not in cached]
+        chunks = [encoded_keys[i:i + 100]
+                  for i in range(0, len(encoded_keys), 100)]
+        if not ordered:
+            for item_raw in cached.values():
+                yield cls.from_raw_data(item_raw, attributes)
+        if not chunks and not cached:
+            return
+
+        pool = None
+        if workers > 1 and len(chunks) > 1:
+            pool = ThreadPool(min(workers, len(chunks)))
+            results = pool.imap_unordered(
+                lambda chunk: cls._batch_get_chunk(chunk, projection), chunks)
+        else:
+            results = (cls._batch_get_chunk(chunk, projection)
+                       for chunk in chunks)
+        try:
+            if not ordered:
+                for items in results:
+                    if not attributes:
+                        for item in items:
+                            cls._cache_store(item)
+                    for item in hooks.decode(cls, 'batch_get_item', items,
+                                             attributes):
+                        yield item
+                return
+            found = cached
+            for items in results:
+                for item in items:
+                    if not attributes:
+                        cls._cache_store(item)
+                    found[cls._item_key_signature(item)] = item
+            items = (found[signature] for signature in encoded
+                     if signature in found)
+            for item in hooks.decode(cls, 'batch_get_item', items,
+                                     attributes):
+                yield item
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    @classmethod
+    def _batch_get_chunk(cls, keys, projection=None):
+        """Get the raw items of up to 100 keys, retrying the unprocessed keys
+        with exponential backoff.
+
+        """
+        projections = None
+        if projection:
+            projections = {cls.get_table_name(): {
+                'ProjectionExpression': projection['projection_expression'],
+                'ExpressionAttributeNames':
+                    projection['expression_attribute_names'],
+            }}
+        return [item for _, item
+                in _batch_get_items([(cls, key) for key in keys],
+                                    projections)]
+
+    @classmethod
+    def _cache_key(cls, key):
+        return cls.get_table_name(), _key_signature(key)
+
+    @classmethod
+    def _cache_store(cls, item_raw):
+        """Store the raw item to the cache if the model has one."""
+        if cls.cache is not None:
+            cls.cache.set(
+                (cls.get_table_name(), cls._item_key_signature(item_raw)),
+                item_raw)
+
+    @classmethod
+    def _cache_evict(cls, key):
+        """Evict the item of the encoded key from the cache if the model
+        has one.
+
+        """
+        if cls.cache is not None:
+            cls.cache.delete(cls._cache_key(key))
+
+    @classmethod
+    def _item_key_signature(cls, item_raw):
+        return _key_signature(
+            dict((key.name, item_raw[key.name]) for key in cls._get_keys()))
+
+    @classmethod
+    def batch_write(cls, workers=1, write_capacity=None, flush_at=None):
+        """Batch writer of the model. See :class:`BatchWrite`."""
+        return BatchWrite(cls, workers=workers, write_capacity=write_capacity,
+                          flush_at=flush_at)
+
+    @classmethod
+    def aget_item(cls, hash_key, range_key=None):
+        """Non-blocking :meth:`get_item`.
+
+        :returns: :class:`multiprocessing.pool.AsyncResult` of the item.
+
+        """
+        return cls._executor.submit(cls.get_item, hash_key, range_key)
+
+    @classmethod
+    def aput_item(cls, **data):
+        """Non-blocking :meth:`put_item`.
+
+        :returns: :class:`multiprocessing.pool.AsyncResult` of the item.
+
+        """
+        return cls._executor.submit(cls.put_item, **data)
+
+    @classmethod
+    def aquery(cls, **kwargs):
+        """Non-blocking :meth:`query`.
+
+        :returns: :class:`multiprocessing.pool.AsyncResult` of the list of
+                  the items.
+
+        """
+        return cls._executor.submit(lambda: list(cls.query(**kwargs)))
+
+    @classmethod
+    def ascan(cls, **kwargs):
+        """Non-blocking :meth:`scan`.
+
+        :returns: :class:`multiprocessing.pool.AsyncResult` of the list of
+                  the items.
+
+        """
+        return cls._executor.submit(lambda: list(cls.scan(**kwargs)))
+
+    @classmethod
+    def abatch_get(cls, *keys, **options):
+        """Non-blocking :meth:`batch_get`.
+
+        :returns: :class:`multiprocessing.pool.AsyncResult` of the list of
+                  the items.
+
+        """
+        return cls._executor.submit(
+            lambda: list(cls.batch_get(*keys, **options)))
+
+    @classmethod
+    def from_raw_data(cls, item_raw, attributes=None, lazy=None):
         """Translate the raw item data from the DynamoDBConnection
         to the item object.
 
+        The decoded values are populated directly without calling
+        :meth:`__init__` of the model.
+
+        :param attributes: the names of the attributes to load. If given,
+                           the item is partially loaded with them only.
+        :type attributes: :class:`collections.Iterable`
+        :param lazy: decode the attributes on their first access.
+                     Defaults to :attr:`lazy_decode`.
+        :type lazy: :class:`bool`
+
         """
-        deserialized = {}
-        for name, value in item_raw.items():
-            attr = getattr(cls, name, None)
-            if attr is None:
-                continue
-            deserialized[name] = attr.decode(value)
-        return cls(**deserialized)
+        item = cls.__new__(cls)
+        item._data = data = cls._data_class()
+        item._raw = item._loaded = None
+        decoders = cls._decoders
+        if attributes is not None:
+            item._loaded = attributes = frozenset(attributes)
+        if lazy is None:
+            lazy = cls.lazy_decode
+
+        if lazy:
+            item._raw = dict(
+                (name, value) for name, value in item_raw.items()
+                if name in decoders and
+                (attributes is None or name in attributes))
+        elif attributes is None:
+            for name, value in item_raw.items():
+                decode = decoders.get(name)
+                if decode is not None:
+                    data[name] = decode(value)
+        else:
+            for name in attributes:
+                if name in item_raw and name in decoders:
+                    data[name] = decoders[name](item_raw[name])
+        item._set_defaults()
+        item._reset_dirty()
+        return item
+
+    @classmethod
+    def _build_projection(cls, attributes, kwargs):
+        """Build the projection expression of the attributes and the keys
+        into the kwargs, and return the names of the projected attributes.
+
+        """
+        names = list(attributes)
+        for key in cls._get_keys():
+            if key.name not in names:
+                names.append(key.name)
+        attribute_names = kwargs.setdefault('expression_attribute_names', {})
+        placeholders = []
+        for i, name in enumerate(names):
+            placeholder = '#p{0}'.format(i)
+            attribute_names[placeholder] = name
+            placeholders.append(placeholder)
+        kwargs['projection_expression'] = ', '.join(placeholders)
+        return names
 
     @classmethod
     def _build_filter_expression(cls, filter_builder, kwargs):
         kwargs['filter_expression'], kwargs['expression_attribute_values'] = \
             filter_builder.build_exp()
 
+    @classmethod
+    def _build_write_expressions(cls, kwargs, update_builder=None,
+                                 condition_builder=None):
+        """Build the update expression and the condition expression of
+        the write, sharing the placeholders.
+
+        """
+        attr_values = AttributeValues()
+        attr_names = AttributeNames()
+        if update_builder:
+            kwargs['update_expression'], _, _ = update_builder.build_exp(
+                attr_values, attr_names, cls._get_attributes())
+        if condition_builder:
+            kwargs['condition_expression'], _ = condition_builder.build_exp(
+                attr_values, attr_names)
+        if attr_values.data:
+            kwargs['expression_attribute_values'] = attr_values.data
+        if attr_names.data:
+            kwargs['expression_attribute_names'] = attr_names.data
+
+    @classmethod
+    def _version_condition(cls, version, condition_builder=None):
+        """The condition that the item is not modified since the `version`,
+        combined with the `condition_builder`.
+
+        """
+        if version is None:
+            guard = AttributeNotExists(cls._version_attribute)
+        else:
+            guard = EQ(cls._version_attribute, version)
+        if condition_builder:
+            return guard & condition_builder
+        return guard
+
     @classmethod
     def _encode_key(cls, hash_key, range_key=None):
         dynamizer = Dynamizer()
@@ -337,41 +1002,149 @@ class Model(object):
                 cls._indexes.append(attr)
         return cls._indexes
 
+    @classmethod
+    def _request(cls, operation, *args, **kwargs):
+        """Call the operation of the connection, and record the consumed
+        capacity of the response.
+
+        """
+        if cls.return_consumed_capacity:
+            kwargs['return_consumed_capacity'] = cls.return_consumed_capacity
+        return cls._send(operation, getattr(cls._get_connection(), operation),
+                         args, kwargs)
+
+    @classmethod
+    def _make_request(cls, operation, action, body):
+        """Send the request of the action which the connection has no method
+        for, such as ``'TransactWriteItems'``, with the JSON body.
+
+        """
+        if cls.return_consumed_capacity:
+            body['ReturnConsumedCapacity'] = cls.return_consumed_capacity
+        return cls._send(operation, cls._get_connection().make_request,
+                         (action, json.dumps(body)), {})
+
+    @classmethod
+    def _send(cls, operation, func, args, kwargs):
+        if hooks.active():
+            result = hooks.request(operation, func, args, kwargs,
+                                   cls._retry_policy)
+        else:
+            result = func(*args, **kwargs)
+        if result and 'ConsumedCapacity' in result:
+            record_capacity(operation, result['ConsumedCapacity'])
+        return result
+
     @classmethod
     def _get_connection(cls):
-        if cls._conn:
-            return cls._conn
-        cls._conn = DynamoDBConnection()
-        return cls._conn
+        conn = cls._connection_manager.get_connection()
+        if cls._retry_policy is not None:
+            return RetryingConnection(conn, cls._retry_policy)
+        return conn
+
+
+def _key_signature(key):
+    """Hashable signature of the encoded key."""
+    return tuple(sorted((name, tuple(value.items()))
+                        for name, value in key.items()))
+
+
+def _make_default(default):
+    value = copy.copy(default)
+    if callable(value):
+        value = value()
+    return value
 
 
 class BatchWrite(object):
+    """Batch writer of the models.
+
+    The requests are buffered and sent in 25-item batches as soon as
+    `flush_at` requests are buffered, and the rest are sent on exit.
+    Requests of the same key in the buffer are collapsed into the last one,
+    because DynamoDB rejects a batch with duplicate keys. With several
+    workers, a batch writing a key of a batch in flight is sent after it
+    is done, so the writes of the same key are applied in order. A batch may
+    contain the requests of several tables. The writes have no condition, so
+    :class:`~bynamodb.attributes.VersionAttribute` is neither checked nor
+    incremented.
+
+    :param model: the model written by :meth:`put_item` and
+                  :meth:`delete_item`. The items of any models are written
+                  by :meth:`put` and :meth:`delete`.
+    :param workers: the number of the 25-item requests sent concurrently.
+    :type workers: :class:`int`
+    :param write_capacity: the write capacity units per second to target.
+                           If given, the requests are throttled by
+                           a :class:`~bynamodb.retry.RateLimiter`.
+    :type write_capacity: :class:`numbers.Real`
+    :param flush_at: the number of the buffered requests which triggers
+                     sending. Only full 25-item batches are sent until exit.
+                     Defaults to 25 per worker.
+    :type flush_at: :class:`int`
+
+    """
 
-    def __init__(self, model):
+    def __init__(self, model=None, workers=1, write_capacity=None,
+                 flush_at=None):
         self.model = model
-        self.to_put = []
-        self.to_delete = []
+        self.workers = workers
+        self.rate_limiter = None
+        if write_capacity:
+            self.rate_limiter = RateLimiter(write_capacity)
+        self.flush_at = max(flush_at or 25 * workers, 25)
+        # The table name and the key signature to the pair of the model and
+        # the request.
+        self._pending = OrderedDict()
+        self._pool = None
+        # The pairs of the result of the batch in flight and the signatures
+        # of its keys.
+        self._in_flight = []
+
+    @property
+    def to_put(self):
+        """Buffered put requests."""
+        return [request for _, request in self._pending.values()
+                if 'PutRequest' in request]
+
+    @property
+    def to_delete(self):
+        """Buffered delete requests."""
+        return [request for _, request in self._pending.values()
+                if 'DeleteRequest' in request]
 
     def put_item(self, **data):
-        item = self.model(**data)
-        item.validate()
-        self.to_put.append(
-            {
-                'PutRequest': {
-                    'Item': item.serialize()
-                }
-            }
-        )
+        self.put(self._get_model()(**data))
 
     def delete_item(self, *keys):
-        key = self.model._encode_key(*keys)
-        self.to_delete.append(
-            {
-                'DeleteRequest': {
-                    'Key': key
-                }
-            }
-        )
+        self.delete(self._get_model(), *keys)
+
+    def _get_model(self):
+        if self.model is None:
+            raise ValueError('The batch writer has no model. Use put() and '
+                             'delete() to write the items of any models')
+        return self.model
+
+    def put(self, item):
+        """Put the item of any model."""
+        model = item.__class__
+        serialized = item._serialize()
+        self._add(model, model._item_key_signature(serialized),
+                  {
+                      'PutRequest': {
+                          'Item': serialized
+                      }
+                  })
+
+    def delete(self, model, *keys):
+        """Delete the item of the model of the keys."""
+        key = model._encode_key(*keys)
+        self._add(model, _key_signature(key),
+                  {
+                      'DeleteRequest': {
+                          'Key': key
+                      }
+                  })
 
     def __enter__(self):
         return self
@@ -380,16 +1153,432 @@ class BatchWrite(object):
         self.send_request()
 
     def send_request(self):
-        unprocessed = []
-        unprocessed.extend(self.to_put)
-        unprocessed.extend(self.to_delete)
-        while unprocessed:
-            nexts = unprocessed[:25]
-            unprocessed = unprocessed[25:]
-            batch_request = {
-                self.model.get_table_name(): nexts
-            }
-            result = (self.model.
-                      _get_connection().batch_write_item(batch_request))
-            unprocessed.extend(result.get('UnprocessedItems', {}).
-                               get(self.model.get_table_name(), []))
+        """Send all of the buffered requests and wait for them."""
+        try:
+            self._flush(partial=True)
+            while self._in_flight:
+                self._in_flight.pop(0)[0].get()
+        finally:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool = None
+            del self._in_flight[:]
+
+    def _add(self, model, signature, request):
+        signature = model.get_table_name(), signature
+        self._pending.pop(signature, None)
+        self._pending[signature] = model, request
+        if len(self._pending) >= self.flush_at:
+            self._flush()
+
+    def _flush(self, partial=False):
+        """Send the buffered requests in 25-item batches. The last batch of
+        less than 25 items is kept buffered unless `partial` is `True`.
+
+        """
+        pending = self._pending
+        while len(pending) >= 25 or (partial and pending):
+            items = [pending.popitem(last=False)
+                     for _ in range(min(25, len(pending)))]
+            batch = [pair for _, pair in items]
+            if self.workers > 1:
+                self._send_async(batch,
+                                 set(signature for signature, _ in items))
+            else:
+                self._send_batch(batch)
+
+    def _send_async(self, batch, signatures):
+        if self._pool is None:
+            self._pool = ThreadPool(self.workers)
+        # The batch writing a key of a batch in flight waits for it,
+        # so that the writes of the same key are applied in order.
+        for in_flight in list(self._in_flight):
+            if not signatures.isdisjoint(in_flight[1]):
+                self._in_flight.remove(in_flight)
+                in_flight[0].get()
+        self._in_flight.append(
+            (self._pool.apply_async(self._send_batch, (batch,)), signatures))
+        # Keep at most a batch queued per worker to bound the memory.
+        while len(self._in_flight) > self.workers * 2:
+            self._in_flight.pop(0)[0].get()
+
+    def _send_batch(self, requests):
+        """Send up to 25 pairs of the model and the request."""
+        for group in _group_by_connection(requests):
+            self._send_requests(group)
+
+    def _send_requests(self, requests):
+        """Send the pairs of the model and the request through the connection
+        of the models, retrying the unprocessed items with exponential
+        backoff.
+
+        """
+        models = {}
+        request_items = {}
+        for model, request in requests:
+            table_name = model.get_table_name()
+            models[table_name] = model
+            request_items.setdefault(table_name, []).append(request)
+        sender = requests[0][0]
+        rate_limiter = self.rate_limiter
+        attempt = 0
+        while request_items:
+            count = sum(len(items) for items in request_items.values())
+            if rate_limiter:
+                rate_limiter.acquire(count)
+            result = sender._request(
+                'batch_write_item', request_items,
+                return_consumed_capacity='TOTAL' if rate_limiter else None)
+            unprocessed = result.get('UnprocessedItems') or {}
+            if rate_limiter:
+                consumed = capacity_units(result.get('ConsumedCapacity'))
+                rate_limiter.adjust(consumed - count)
+                if unprocessed:
+                    rate_limiter.throttled()
+                else:
+                    rate_limiter.succeeded()
+            for table_name, items in request_items.items():
+                model = models[table_name]
+                if model.cache is not None:
+                    _update_cache(model, items,
+                                  unprocessed.get(table_name, []))
+            request_items = unprocessed
+            if request_items:
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+
+
+def _group_by_connection(pairs):
+    """Group the pairs of the model and the request by the connection manager
+    and the retry policy of the models, as a request is sent through
+    the connection of a model.
+
+    """
+    groups = OrderedDict()
+    for model, request in pairs:
+        groups.setdefault((model._connection_manager, model._retry_policy),
+                          []).append((model, request))
+    return groups.values()
+
+
+def _update_cache(model, requests, unprocessed):
+    """Write the processed requests through the cache of the model."""
+    for request in requests:
+        if request in unprocessed:
+            continue
+        if 'PutRequest' in request:
+            model._cache_store(request['PutRequest']['Item'])
+        else:
+            model._cache_evict(request['DeleteRequest']['Key'])
+
+
+def batch_write(workers=1, write_capacity=None, flush_at=None):
+    """Batch writer of the items of any models, packing the requests of
+    several tables into shared 25-item requests. See :class:`BatchWrite`.
+
+    """
+    return BatchWrite(workers=workers, write_capacity=write_capacity,
+                      flush_at=flush_at)
+
+
+def batch_get(*keys, **options):
+    """Get the items of several models, packing the keys of the tables
+    into shared 100-key requests.
+
+    :param keys: the tuples of the model, the hash key and the range key.
+    :param workers: the number of the 100-key requests sent concurrently.
+                    Defaults to 1.
+    :type workers: :class:`int`
+    :returns: the list of the items in the order of the keys.
+              `None` for the items not found.
+
+    """
+    workers = options.pop('workers', 1)
+    if options:
+        raise TypeError('batch_get() got an unexpected keyword argument '
+                        '{0!r}'.format(sorted(options)[0]))
+    signatures = []
+    encoded = OrderedDict()
+    for key in keys:
+        model = key[0]
+        encoded_key = model._encode_key(*key[1:])
+        signature = model.get_table_name(), _key_signature(encoded_key)
+        signatures.append(signature)
+        encoded.setdefault(signature, (model, encoded_key))
+
+    found = {}
+    to_fetch = []
+    for signature, (model, key) in encoded.items():
+        item_raw = None
+        if model.cache is not None:
+            item_raw = model.cache.get(model._cache_key(key))
+        if item_raw is None:
+            to_fetch.append((model, key))
+        else:
+            found[signature] = model, item_raw
+    chunks = [to_fetch[i:i + 100] for i in range(0, len(to_fetch), 100)]
+    if workers > 1 and len(chunks) > 1:
+        pool = ThreadPool(min(workers, len(chunks)))
+        try:
+            results = pool.map(_batch_get_items, chunks)
+        finally:
+            pool.terminate()
+    else:
+        results = [_batch_get_items(chunk) for chunk in chunks]
+    for items in results:
+        for model, item_raw in items:
+            model._cache_store(item_raw)
+            signature = (model.get_table_name(),
+                         model._item_key_signature(item_raw))
+            found[signature] = model, item_raw
+
+    # The items of each model are decoded as a batch.
+    by_model = OrderedDict()
+    for signature, (model, item_raw) in found.items():
+        by_model.setdefault(model, []).append((signature, item_raw))
+    decoded = {}
+    for model, pairs in by_model.items():
+        items = hooks.decode(model, 'batch_get_item',
+                             [item_raw for _, item_raw in pairs])
+        for (signature, _), item in zip(pairs, list(items)):
+            decoded[signature] = item
+    return [decoded.get(signature) for signature in signatures]
+
+
+def _batch_get_items(keys, projections=None):
+    """Get the raw items of up to 100 keys of the models, retrying
+    the unprocessed keys with exponential backoff.
+
+    :param keys: the pairs of the model and the encoded key.
+    :param projections: the table name to the projection parameters of
+                        the table.
+    :returns: the pairs of the model and the raw item.
+
+    """
+    items = []
+    for group in _group_by_connection(keys):
+        items.extend(_batch_get_group(group, projections))
+    return items
+
+
+def _batch_get_group(keys, projections):
+    """Get the raw items of the keys of the models sharing the connection."""
+    models = {}
+    request_items = {}
+    for model, key in keys:
+        table_name = model.get_table_name()
+        models[table_name] = model
+        request = request_items.get(table_name)
+        if request is None:
+            request = request_items[table_name] = dict(
+                (projections or {}).get(table_name, {}))
+            request['Keys'] = []
+        request['Keys'].append(key)
+    sender = keys[0][0]
+    items = []
+    attempt = 0
+    while request_items:
+        result = sender._request('batch_get_item', request_items)
+        for table_name, table_items in result['Responses'].items():
+            model = models[table_name]
+            items.extend((model, item) for item in table_items)
+        request_items = result.get('UnprocessedKeys') or {}
+        if request_items:
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+    return items
+
+
+# The keyword arguments of the expressions to the request parameters.
+_EXPRESSION_PARAMS = {
+    'update_expression': 'UpdateExpression',
+    'condition_expression': 'ConditionExpression',
+    'expression_attribute_names': 'ExpressionAttributeNames',
+    'expression_attribute_values': 'ExpressionAttributeValues',
+}
+
+
+class Transaction(object):
+    """Transaction writing the items of the models atomically.
+
+    The writes are collected in the context, and sent in a single
+    ``TransactWriteItems`` request when it exits without an exception.
+    If any condition of the writes is not met, none of them is applied and
+    :exc:`boto.exception.JSONResponseError` of
+    ``TransactionCanceledException`` is raised.
+
+    :param client_request_token: the token making the retries of
+                                 the request idempotent.
+                                 Defaults to a random token.
+    :type client_request_token: :class:`str`
+
+    """
+
+    #: (:class:`int`) The maximum number of the writes of a transaction.
+    max_items = 100
+
+    def __init__(self, client_request_token=None):
+        self.client_request_token = (client_request_token or
+                                     str(uuid.uuid4()))
+        self._items = []
+        self._models = []
+        self._on_commit = []
+
+    def put(self, item, condition_builder=None):
+        """Put the item as a whole.
+
+        :param condition_builder: the condition of the write.
+        :type condition_builder: :class:`~bynamodb.filterexps.Operator`
+
+        """
+        model = item.__class__
+        if item._loaded is not None:
+            raise PartialItemException(
+                'The item loaded with the projection cannot be put')
+        version = model._version_attribute
+        if version is not None:
+            current = getattr(item, version)
+            condition_builder = model._version_condition(current,
+                                                         condition_builder)
+        serialized = item._serialize()
+        if version is not None:
+            serialized[version] = model._get_attributes()[version].encode(
+                (current or 0) + 1)
+
+        def on_commit():
+            if version is not None:
+                item._data[version] = (current or 0) + 1
+            item._reset_dirty()
+            model._cache_store(serialized)
+        self._add(model, 'Put', {'Item': serialized},
+                  condition_builder=condition_builder, on_commit=on_commit)
+
+    def update(self, model, hash_key, range_key=None, update_builder=None,
+               condition_builder=None):
+        """Update the item of the key. See
+        :meth:`~bynamodb.model.Model.update_item`.
+
+        """
+        actions = [update_builder] if update_builder else []
+        if model._version_attribute is not None:
+            actions.append(Add(model._version_attribute, 1))
+        if not actions:
+            raise ValueError('The update of the transaction has no action')
+        key = model._encode_key(hash_key, range_key)
+        self._add(model, 'Update', {'Key': key}, Update(*actions),
+                  condition_builder, lambda: model._cache_evict(key))
+
+    def delete(self, item, condition_builder=None):
+        """Delete the item.
+
+        :param condition_builder: the condition of the write.
+        :type condition_builder: :class:`~bynamodb.filterexps.Operator`
+
+        """
+        model = item.__class__
+        key = item._get_encoded_key()
+        if model._version_attribute is not None:
+            condition_builder = model._version_condition(
+                getattr(item, model._version_attribute), condition_builder)
+
+        def on_commit():
+            item._reset_dirty(persisted=False)
+            model._cache_evict(key)
+        self._add(model, 'Delete', {'Key': key},
+                  condition_builder=condition_builder, on_commit=on_commit)
+
+    def condition_check(self, model, hash_key, range_key=None,
+                        condition_builder=None):
+        """Require the condition of the item of the key without writing it.
+
+        :param condition_builder: the condition of the item. Required.
+        :type condition_builder: :class:`~bynamodb.filterexps.Operator`
+
+        """
+        if condition_builder is None:
+            raise ValueError('The condition check of the transaction has no '
+                             'condition')
+        self._add(model, 'ConditionCheck',
+                  {'Key': model._encode_key(hash_key, range_key)},
+                  condition_builder=condition_builder)
+
+    def _add(self, model, action, request, update_builder=None,
+             condition_builder=None, on_commit=None):
+        if len(self._items) >= self.max_items:
+            raise ValueError('A transaction cannot have more than '
+                             '{0} writes'.format(self.max_items))
+        kwargs = {}
+        model._build_write_expressions(kwargs, update_builder,
+                                       condition_builder)
+        request['TableName'] = model.get_table_name()
+        for name, value in kwargs.items():
+            request[_EXPRESSION_PARAMS[name]] = value
+        self._items.append({action: request})
+        self._models.append(model)
+        if on_commit is not None:
+            self._on_commit.append(on_commit)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if type is None:
+            self.commit()
+
+    def commit(self):
+        """Send the collected writes."""
+        if not self._items:
+            return
+        self._models[0]._make_request(
+            'transact_write_items', 'TransactWriteItems',
+            {'TransactItems': self._items,
+             'ClientRequestToken': self.client_request_token})
+        for on_commit in self._on_commit:
+            on_commit()
+        self._items = []
+        self._models = []
+        self._on_commit = []
+
+
+def transact_get(*keys):
+    """Get the items of the models atomically in a single
+    ``TransactGetItems`` request.
+
+    The items are always read from the table instead of the cache of
+    the models, and stored to the cache.
+
+    :param keys: the tuples of the model, the hash key and the range key
+                 of up to 100 items.
+    :returns: the list of the items in the order of the keys.
+              `None` for the items not found.
+
+    """
+    if len(keys) > Transaction.max_items:
+        raise ValueError('A transaction cannot get more than '
+                         '{0} items'.format(Transaction.max_items))
+    models = []
+    items = []
+    for key in keys:
+        model = key[0]
+        models.append(model)
+        items.append({'Get': {'TableName': model.get_table_name(),
+                              'Key': model._encode_key(*key[1:])}})
+    if not items:
+        return []
+    result = models[0]._make_request('transact_get_items',
+                                     'TransactGetItems',
+                                     {'TransactItems': items})
+
+    # The items of each model are decoded as a batch.
+    by_model = OrderedDict()
+    for i, (model, response) in enumerate(zip(models, result['Responses'])):
+        if 'Item' in response:
+            model._cache_store(response['Item'])
+            by_model.setdefault(model, []).append((i, response['Item']))
+    found = [None] * len(models)
+    for model, pairs in by_model.items():
+        decoded = hooks.decode(model, 'transact_get_items',
+                               [item_raw for _, item_raw in pairs])
+        for (i, _), item in zip(pairs, list(decoded)):
+            found[i] = item
+    return found
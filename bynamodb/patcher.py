@@ -1,6 +1,9 @@
 from boto.dynamodb2.layer1 import DynamoDBConnection
 
+from .connection import ConnectionManager, ConnectionPool
+from .executor import Executor
 from .model import Model
+from .retry import RetryPolicy
 
 
 def patch_from_config(config):
@@ -8,6 +11,17 @@ def patch_from_config(config):
         patch_dynamodb_connection(**config['DYNAMODB_CONNECTION'])
     if 'DYNAMODB_PREFIX' in config:
         patch_table_name_prefix(config['DYNAMODB_PREFIX'])
+    if 'DYNAMODB_CONNECTION_POOL' in config:
+        patch_connection_manager(
+            ConnectionPool(**config['DYNAMODB_CONNECTION_POOL']))
+    if 'DYNAMODB_CONNECTION_MANAGER' in config:
+        patch_connection_manager(config['DYNAMODB_CONNECTION_MANAGER'])
+    if 'DYNAMODB_RETRY' in config:
+        patch_retry_policy(RetryPolicy(**config['DYNAMODB_RETRY']))
+    if 'DYNAMODB_CONSUMED_CAPACITY' in config:
+        patch_consumed_capacity(config['DYNAMODB_CONSUMED_CAPACITY'])
+    if 'DYNAMODB_EXECUTOR_WORKERS' in config:
+        patch_executor(Executor(config['DYNAMODB_EXECUTOR_WORKERS']))
 
 
 def patch_dynamodb_connection(**kwargs):
@@ -36,3 +50,57 @@ def patch_table_name_prefix(prefix):
     """Patch the table name prefix"""
 
     Model._table_prefix = prefix
+
+
+def patch_connection_manager(manager):
+    """Patch the connection manager shared by all models.
+
+    :param manager: the connection manager.
+    :type manager: :class:`~bynamodb.connection.ConnectionManager`
+
+    """
+    if Model._retry_policy is not None and \
+            isinstance(manager, ConnectionManager):
+        manager.number_retries = 0
+    Model._connection_manager = manager
+
+
+def patch_executor(executor):
+    """Patch the executor of the non-blocking operations shared by
+    all models.
+
+    :param executor: the executor.
+    :type executor: :class:`~bynamodb.executor.Executor`
+
+    """
+    Model._executor = executor
+
+
+def patch_retry_policy(policy):
+    """Patch the retry policy of the requests shared by all models.
+
+    :param policy: the retry policy. `None` disables the retries.
+    :type policy: :class:`~bynamodb.retry.RetryPolicy`
+
+    While a policy is patched, the connections of
+    a :class:`~bynamodb.connection.ConnectionManager` do not retry by
+    themselves, since boto would retry a throttled request 10 times before
+    the policy sees it. The other connection managers have to disable
+    the retries of their connections.
+
+    """
+    Model._retry_policy = policy
+    manager = Model._connection_manager
+    if isinstance(manager, ConnectionManager):
+        manager.number_retries = None if policy is None else 0
+        manager.reset()
+
+
+def patch_consumed_capacity(mode):
+    """Patch `ReturnConsumedCapacity` of the requests of all models.
+
+    :param mode: ``'TOTAL'``, ``'INDEXES'`` or `None` not to request.
+    :type mode: :class:`str`
+
+    """
+    Model.return_consumed_capacity = mode
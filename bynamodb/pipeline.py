@@ -0,0 +1,213 @@
+"""Multiprocess pipelines over the parallel scan.
+
+The segments of the scan are fanned out to worker processes. Each worker
+scans its segments page by page, decodes the items with
+:meth:`~bynamodb.model.Model.from_raw_data` and applies the user function,
+so that decoding and processing the items are not bound to the single
+process. The results are streamed back to the parent process through
+a bounded queue.
+
+"""
+import multiprocessing
+import os
+import pickle
+from Queue import Empty
+
+from .exceptions import SegmentScanException, WorkerProcessException
+
+
+def scan_map(model, func, total_segments, processes=None, buffer_pages=2,
+             **scan_options):
+    """Apply the function to every item of the table in worker processes.
+
+    The results are yielded as soon as the page is processed, so their order
+    is not defined. If any segment fails, the other segments are still
+    processed to the end, and
+    :class:`~bynamodb.exceptions.SegmentScanException` is raised after all
+    of them are done.
+
+    :param model: the model to scan. It must be importable by the worker
+                  processes if they are not forked.
+    :param func: the function called with each item. It returns a picklable
+                 value.
+    :type func: :class:`collections.Callable`
+    :param total_segments: the number of segments of the parallel scan.
+    :type total_segments: :class:`int`
+    :param processes: the number of the worker processes.
+                      Defaults to the number of the CPUs.
+    :type processes: :class:`int`
+    :param buffer_pages: the number of the processed pages buffered
+                         per worker while the parent is consuming them.
+    :type buffer_pages: :class:`int`
+    :param scan_options: keyword arguments of
+                         :meth:`~bynamodb.model.Model.scan`.
+
+    """
+    for values in _run(model, _map_segment, func, total_segments, processes,
+                       buffer_pages, scan_options):
+        for value in values:
+            yield value
+
+
+def scan_reduce(model, func, reducer, initializer, total_segments,
+                processes=None, **scan_options):
+    """Map every item of the table with the function and reduce the values
+    in worker processes.
+
+    Each worker reduces the values of a segment starting from `initializer`,
+    and the parent reduces the partial results of the segments, so the
+    `reducer` must be associative and commutative and the `initializer` must
+    be its identity.
+
+    :param func: the function called with each item.
+    :type func: :class:`collections.Callable`
+    :param reducer: the function of two values which combines them into one.
+                    The partial results must be picklable.
+    :type reducer: :class:`collections.Callable`
+    :param initializer: the initial value of the reduction.
+    :returns: the reduced value.
+
+    See :func:`scan_map` for the other parameters.
+
+    """
+    partials = _run(model, _reduce_segment, (func, reducer, initializer),
+                    total_segments, processes, 1, scan_options)
+    return reduce(reducer, (value for values in partials for value in values),
+                  initializer)
+
+
+def _map_segment(result_set, func, send):
+    for page in result_set.pages():
+        send(page.last_evaluated_key, [func(item) for item in page])
+
+
+def _reduce_segment(result_set, func, send):
+    func, reducer, value = func
+    for item in result_set:
+        value = reducer(value, func(item))
+    send(None, [value])
+
+
+def _run(model, process_segment, func, total_segments, processes,
+         buffer_pages, scan_options):
+    """Run the workers, and yield the lists of values they send.
+
+    Each message from a worker is the tuple of its pid, the segment, the last
+    evaluated key of the segment and the values. The values are `None` when
+    the segment is started, a :class:`_Done` when it is done, and
+    a :class:`_Failure` when it fails. The segment is `None` when the worker
+    is done.
+
+    """
+    processes = min(processes or multiprocessing.cpu_count(), total_segments)
+    segments = multiprocessing.Queue()
+    for segment in range(total_segments):
+        segments.put(segment)
+    for _ in range(processes):
+        segments.put(None)
+    results = multiprocessing.Queue(buffer_pages * processes)
+
+    workers = {}
+    for _ in range(processes):
+        worker = multiprocessing.Process(
+            target=_work,
+            args=(model, process_segment, func, total_segments, scan_options,
+                  segments, results))
+        worker.daemon = True
+        worker.start()
+        workers[worker.pid] = worker
+
+    running = {}
+    cursors = {}
+    failures = {}
+    finished = set()
+    try:
+        while workers:
+            try:
+                pid, segment, key, values = results.get(timeout=0.1)
+            except Empty:
+                _check_workers(workers, running, cursors, failures)
+                continue
+            if segment is None:
+                del workers[pid]
+            elif values is None:
+                running[pid] = segment
+                cursors[segment] = key
+            elif isinstance(values, _Done):
+                del running[pid]
+                finished.add(segment)
+            elif isinstance(values, _Failure):
+                del running[pid]
+                failures[segment] = (cursors[segment], values.error)
+            else:
+                cursors[segment] = key
+                yield values
+    finally:
+        for worker in workers.values():
+            worker.terminate()
+            worker.join()
+    # The segments left in the queue are never run if the workers exited.
+    for segment in range(total_segments):
+        if segment not in finished and segment not in failures:
+            failures[segment] = (cursors.get(segment), WorkerProcessException(
+                'The segment is not scanned as the worker processes exited'))
+    if failures:
+        raise SegmentScanException(failures)
+
+
+def _check_workers(workers, running, cursors, failures):
+    """Fail the segments of the workers which exited abnormally. A worker
+    exited normally has sent all of its messages, which are still to be read.
+
+    """
+    for pid, worker in workers.items():
+        if worker.is_alive() or not worker.exitcode:
+            continue
+        del workers[pid]
+        segment = running.pop(pid, None)
+        if segment is not None:
+            failures[segment] = (cursors[segment], WorkerProcessException(
+                'The worker process exited with {0}'.format(worker.exitcode)))
+
+
+def _work(model, process_segment, func, total_segments, scan_options,
+          segments, results):
+    pid = os.getpid()
+    # The connections inherited from the parent must not be shared.
+    model._connection_manager.reset()
+    while True:
+        segment = segments.get()
+        if segment is None:
+            break
+        result_set = model.scan(segment=segment,
+                                total_segments=total_segments,
+                                **scan_options)
+        results.put((pid, segment, result_set.cursor, None))
+
+        def send(key, values):
+            results.put((pid, segment, key, values))
+        try:
+            process_segment(result_set, func, send)
+        except Exception as e:
+            results.put((pid, segment, None, _Failure(e)))
+        else:
+            results.put((pid, segment, None, _Done()))
+    results.put((pid, None, None, None))
+
+
+class _Done(object):
+    """Message of the segment processed to the end."""
+
+
+class _Failure(object):
+    """Exception raised by a worker, passed through the queue. The exception
+    is replaced with its representation if it cannot be pickled.
+
+    """
+
+    def __init__(self, error):
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = Exception(repr(error))
+        self.error = error
@@ -1,26 +1,160 @@
+import base64
+import json
+import threading
+from multiprocessing.pool import ThreadPool
+from Queue import Empty, Full, Queue
+
+from . import hooks
+from .capacity import capacity_units
+from .columns import iter_columns, to_columns
+from .exceptions import SegmentScanException
+
+
+class Page(object):
+    """A page of the result, which is the response of a single request."""
+
+    def __init__(self, items, last_evaluated_key, count, scanned_count,
+                 consumed_capacity):
+        #: (:class:`list`) The items of the page.
+        self.items = items
+
+        #: (:class:`dict`) The key to fetch the next page from.
+        #: `None` if it is the last page.
+        self.last_evaluated_key = last_evaluated_key
+
+        #: (:class:`int`) The number of the items of the page.
+        self.count = count
+
+        #: (:class:`int`) The number of the items evaluated before
+        #: the filter is applied.
+        self.scanned_count = scanned_count
+
+        #: (:class:`float`) The capacity units consumed by the page.
+        self.consumed_capacity = consumed_capacity
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
 class ResultSet(object):
     """Result of the scan & query operation of the model."""
 
-    def __init__(self, model, operation, kwargs):
+    def __init__(self, model, operation, kwargs, prefetch=0, attributes=None,
+                 checkpoint=None, checkpoint_every=1, page_size=None):
         self.model = model
         self.operation = operation
         self.kwargs = kwargs
 
+        #: (:class:`int`) The maximum number of the items requested
+        #: per page, while the `limit` argument bounds the total items.
+        self.page_size = page_size
+
+        #: (:class:`list`) The names of the projected attributes.
+        #: `None` if the items are fully loaded.
+        self.attributes = attributes
+
+        #: (:class:`int`) The number of the pages fetched ahead in background
+        #: while the items of the current page are consumed.
+        self.prefetch = prefetch
+
+        #: (:class:`float`) The capacity units consumed by the requests of
+        #: the last iteration or :meth:`count`. It is counted only if
+        #: the model sets
+        #: :attr:`~bynamodb.model.Model.return_consumed_capacity`.
+        self.consumed_capacity = 0.0
+
+        #: (:class:`int`) The number of the pages fetched by the last
+        #: iteration or :meth:`count`.
+        self.pages_fetched = 0
+
+        #: (:class:`dict`) The last evaluated key of the last page consumed
+        #: by the iteration, from which the rest of the result can be
+        #: fetched. `None` after the last page.
+        self.cursor = kwargs.get('exclusive_start_key')
+
+        #: (:class:`collections.Callable`) The function called with
+        #: :attr:`token` every `checkpoint_every` pages consumed.
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+
+    @property
+    def token(self):
+        """The opaque token of :attr:`cursor`, which can be passed as
+        `start_token` to :meth:`~bynamodb.model.Model.query` and
+        :meth:`~bynamodb.model.Model.scan` to resume the iteration.
+        `None` after the last page.
+
+        """
+        return encode_token(self.cursor)
+
     def __iter__(self):
         """Result items of the operation."""
-        operation = self._get_operation()
-        kwargs = self.kwargs.copy()
-        limit = kwargs.get('limit', None)
-        while True:
-            result = operation(self.model.get_table_name(), **kwargs)
+        for result in self._iter_results():
+            for item in hooks.decode(self.model, self.operation,
+                                     result.get('Items'), self.attributes,
+                                     self.kwargs.get('index_name')):
+                yield item
+
+    def pages(self, raw=False):
+        """Result pages of the operation.
+
+        :param raw: yield the raw items of the pages without decoding.
+        :type raw: :class:`bool`
+        :returns: the iterator of :class:`Page`
+
+        """
+        for result in self._iter_results():
+            items = result.get('Items')
+            if not raw:
+                items = list(hooks.decode(self.model, self.operation, items,
+                                          self.attributes,
+                                          self.kwargs.get('index_name')))
+            yield Page(items, result.get('LastEvaluatedKey'),
+                       result.get('Count'), result.get('ScannedCount'),
+                       capacity_units(result.get('ConsumedCapacity')))
+
+    def to_columns(self):
+        """Decode the result items into columns of NumPy arrays without
+        creating the items. See :func:`~bynamodb.columns.to_columns`.
+
+        :returns: :class:`dict` of the attribute name to
+                  :class:`numpy.ma.MaskedArray`.
+
+        """
+        return to_columns(self.model, self._iter_raw(), self.attributes)
+
+    def iter_columns(self, chunk_size=10000):
+        """Decode the result items into columns of NumPy arrays chunk by
+        chunk. See :func:`~bynamodb.columns.iter_columns`.
+
+        """
+        return iter_columns(self.model, self._iter_raw(), self.attributes,
+                            chunk_size=chunk_size)
+
+    def _iter_raw(self):
+        for result in self._iter_results():
             for raw_item in result.get('Items'):
-                if limit is not None:
-                    limit -= 1
-                yield self.model.from_raw_data(raw_item)
+                yield raw_item
 
-            last_evaluated_key = result.get('LastEvaluatedKey', None)
-            if not self._prepare_next_fetch(kwargs, last_evaluated_key, limit):
-                raise StopIteration
+    def _iter_results(self):
+        self.consumed_capacity = 0.0
+        self.pages_fetched = 0
+        results = self._fetch(self.kwargs.copy())
+        if self.prefetch:
+            results = self._fetch_ahead(results)
+        pages = 0
+        for result in results:
+            yield result
+            # The items of the page are consumed once the next page is
+            # requested, so the cursor never skips unprocessed items.
+            self.cursor = result.get('LastEvaluatedKey')
+            pages += 1
+            if self.checkpoint and (not pages % self.checkpoint_every or
+                                    self.cursor is None):
+                self.checkpoint(self.token)
 
     def count(self):
         """Total count of the matching items.
@@ -28,21 +162,71 @@ class ResultSet(object):
         It sums up the count of partial results, and returns the total count of
         matching items in the table.
         """
-        count = 0
-        operation = self._get_operation()
+        self.consumed_capacity = 0.0
+        self.pages_fetched = 0
         kwargs = self.kwargs.copy()
         kwargs['select'] = 'COUNT'
+        projection = kwargs.pop('projection_expression', None)
+        if projection:
+            # The projection cannot be used with COUNT, so the attribute
+            # names added for its placeholders are dropped as well.
+            attribute_names = kwargs.pop('expression_attribute_names').copy()
+            for placeholder in projection.split(', '):
+                attribute_names.pop(placeholder, None)
+            if attribute_names:
+                kwargs['expression_attribute_names'] = attribute_names
+        return sum(result['Count'] for result in self._fetch(kwargs))
+
+    def _fetch(self, kwargs):
+        """Send the requests of the operation page by page, and yield
+        the raw result of each page.
+
+        """
         limit = kwargs.get('limit', None)
         while True:
-            result = operation(self.model.get_table_name(), **kwargs)
-            count += result['Count']
+            if self.page_size:
+                kwargs['limit'] = (self.page_size if limit is None
+                                   else min(self.page_size, limit))
+            result = self.model._request(self.operation,
+                                         self.model.get_table_name(), **kwargs)
+            self.consumed_capacity += capacity_units(
+                result.get('ConsumedCapacity'))
+            self.pages_fetched += 1
+            yield result
             if limit is not None:
                 limit -= result['Count']
 
             last_evaluated_key = result.get('LastEvaluatedKey', None)
             if not self._prepare_next_fetch(kwargs, last_evaluated_key, limit):
-                break
-        return count
+                return
+
+    def _fetch_ahead(self, results):
+        """Consume the `results` in a background thread, keeping at most
+        :attr:`prefetch` pages buffered ahead of the caller.
+
+        """
+        queue = Queue(self.prefetch)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for result in results:
+                    if not _put(queue, result, stop):
+                        return
+            except Exception as e:
+                _put(queue, _Failure(e), stop)
+            _put(queue, None, stop)
+
+        thread = threading.Thread(target=produce)
+        thread.daemon = True
+        thread.start()
+        try:
+            for result in _drain(queue, 1):
+                if isinstance(result, _Failure):
+                    raise result.error
+                yield result
+        finally:
+            stop.set()
 
     def _prepare_next_fetch(self, kwargs, last_evaluated_key, limit):
         if last_evaluated_key and (limit is None or limit > 0):
@@ -52,5 +236,207 @@ class ResultSet(object):
         return False
 
 
-    def _get_operation(self):
-        return getattr(self.model._get_connection(), self.operation)
+class SegmentedResultSet(object):
+    """Result of the parallel scan operation of the model.
+
+    The table is split into `total_segments` segments, and each segment is
+    scanned by a pool of worker threads. The items of the segments are merged
+    into one iterator.
+
+    """
+
+    #: (:class:`int`) The number of the pages buffered per worker
+    #: while the consumer is processing the items.
+    buffer_pages = 2
+
+    def __init__(self, model, kwargs, total_segments, workers=None,
+                 ordered=False, attributes=None, page_size=None):
+        self.model = model
+        self.kwargs = kwargs
+        self.attributes = attributes
+        self.page_size = page_size
+        self.total_segments = total_segments
+        self.workers = workers or total_segments
+        self.ordered = ordered
+
+        #: (:class:`float`) The capacity units consumed by the segments in
+        #: the last iteration or :meth:`count`.
+        self.consumed_capacity = 0.0
+        self._lock = threading.Lock()
+
+        #: (:class:`dict`) The segments failed in the last iteration.
+        #: It maps the segment number to the tuple of the last evaluated key
+        #: from which the segment can be resumed and the raised exception.
+        self.failures = {}
+
+    def segment(self, segment, exclusive_start_key=None):
+        """The result of a single segment.
+
+        :param segment: the segment number.
+        :type segment: :class:`int`
+        :param exclusive_start_key: the key to start the scan from.
+        :type exclusive_start_key: :class:`collections.Mapping`
+        :returns: :class:`ResultSet`
+
+        """
+        kwargs = self.kwargs.copy()
+        kwargs['segment'] = segment
+        kwargs['total_segments'] = self.total_segments
+        if exclusive_start_key:
+            kwargs['exclusive_start_key'] = exclusive_start_key
+        return ResultSet(self.model, 'scan', kwargs,
+                         attributes=self.attributes, page_size=self.page_size)
+
+    def segments(self):
+        """The results of all segments."""
+        return [self.segment(i) for i in range(self.total_segments)]
+
+    def resume(self, segment):
+        """The rest of the segment failed in the last iteration."""
+        last_evaluated_key, _ = self.failures[segment]
+        return self.segment(segment, last_evaluated_key)
+
+    def __iter__(self):
+        """Result items of the segments.
+
+        If any segment fails, the other segments are still scanned to the end,
+        and :class:`~bynamodb.exceptions.SegmentScanException` is raised
+        after all of them are done.
+
+        """
+        for page in self._iter_pages():
+            for item in hooks.decode(self.model, 'scan', page,
+                                     self.attributes):
+                yield item
+
+    def _iter_raw(self):
+        for page in self._iter_pages():
+            for raw_item in page:
+                yield raw_item
+
+    def _iter_pages(self):
+        self.failures = {}
+        self.consumed_capacity = 0.0
+        stop = threading.Event()
+        if self.ordered:
+            queues = [Queue(self.buffer_pages)
+                      for _ in range(self.total_segments)]
+        else:
+            queue = Queue(self.buffer_pages * self.workers)
+            queues = [queue] * self.total_segments
+        pool = ThreadPool(min(self.workers, self.total_segments))
+        try:
+            for segment in range(self.total_segments):
+                pool.apply_async(self._scan_segment,
+                                 (segment, queues[segment], stop))
+            pool.close()
+
+            if self.ordered:
+                pages = (page for queue in queues
+                         for page in _drain(queue, 1))
+            else:
+                pages = _drain(queues[0], self.total_segments)
+            for page in pages:
+                yield page
+        finally:
+            stop.set()
+            pool.terminate()
+        if self.failures:
+            raise SegmentScanException(self.failures)
+
+    def to_columns(self):
+        """Decode the result items into columns of NumPy arrays without
+        creating the items. See :func:`~bynamodb.columns.to_columns`.
+
+        """
+        return to_columns(self.model, self._iter_raw(), self.attributes)
+
+    def iter_columns(self, chunk_size=10000):
+        """Decode the result items into columns of NumPy arrays chunk by
+        chunk. See :func:`~bynamodb.columns.iter_columns`.
+
+        """
+        return iter_columns(self.model, self._iter_raw(), self.attributes,
+                            chunk_size=chunk_size)
+
+    def count(self):
+        """Total count of the matching items of all segments."""
+        return sum(self.counts())
+
+    def counts(self):
+        """The count of the matching items per segment."""
+        self.consumed_capacity = 0.0
+        pool = ThreadPool(min(self.workers, self.total_segments))
+        segments = self.segments()
+        try:
+            return pool.map(lambda result: result.count(), segments)
+        finally:
+            pool.close()
+            self.consumed_capacity += sum(result.consumed_capacity
+                                          for result in segments)
+
+    def _scan_segment(self, segment, queue, stop):
+        result_set = self.segment(segment)
+        last_evaluated_key = result_set.kwargs.get('exclusive_start_key')
+        try:
+            for result in result_set._fetch(result_set.kwargs.copy()):
+                if not _put(queue, result.get('Items'), stop):
+                    return
+                last_evaluated_key = result.get('LastEvaluatedKey')
+        except Exception as e:
+            self.failures[segment] = (last_evaluated_key, e)
+        finally:
+            with self._lock:
+                self.consumed_capacity += result_set.consumed_capacity
+        _put(queue, None, stop)
+
+
+def encode_token(key):
+    """Serialize the last evaluated key into an opaque token."""
+    if key is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(key, sort_keys=True))
+
+
+def decode_token(token):
+    """Deserialize the last evaluated key from the token
+    made by :func:`encode_token`.
+
+    """
+    if token is None:
+        return None
+    return json.loads(base64.urlsafe_b64decode(str(token)))
+
+
+class _Failure(object):
+    """Exception raised by a producer thread, passed through the queue."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _put(queue, value, stop):
+    """Put the value to the bounded queue unless the consumer stopped.
+    Return `False` if the consumer stopped.
+
+    """
+    while not stop.is_set():
+        try:
+            queue.put(value, timeout=0.1)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def _drain(queue, producers):
+    """Get values from the queue until all of the producers put `None`."""
+    while producers:
+        try:
+            value = queue.get(timeout=0.1)
+        except Empty:
+            continue
+        if value is None:
+            producers -= 1
+        else:
+            yield value
@@ -0,0 +1,195 @@
+import random
+import threading
+import time
+
+from boto.dynamodb2.exceptions import ProvisionedThroughputExceededException
+from boto.exception import JSONResponseError
+
+
+def backoff_delay(attempt, base=0.05, cap=5.0):
+    """The delay in seconds before retrying the `attempt`-th time.
+
+    It grows exponentially from `base` up to `cap`, with full jitter so that
+    concurrent clients do not retry in lockstep.
+
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class RateLimiter(object):
+    """Token bucket which limits the capacity units consumed per second.
+
+    The rate adapts to the table: it is halved whenever the requests are
+    throttled, and recovers toward the target `rate` as they succeed.
+
+    :param rate: the target capacity units per second.
+    :type rate: :class:`numbers.Real`
+    :param burst: the capacity units which can be consumed at once.
+                  Defaults to `rate`.
+    :type burst: :class:`numbers.Real`
+
+    """
+
+    #: (:class:`float`) The lower bound of the rate relative to the target.
+    min_ratio = 0.05
+
+    #: (:class:`float`) The rate recovered per success relative to the target.
+    recovery_ratio = 0.1
+
+    def __init__(self, rate, burst=None):
+        self.target = float(rate)
+        self.rate = self.target
+        self.burst = float(burst or rate)
+        self._tokens = self.burst
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self, units=1):
+        """Take the capacity units, blocking until they are available."""
+        with self._lock:
+            self._refill()
+            self._tokens -= units
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+    def adjust(self, units):
+        """Correct the estimate passed to :meth:`acquire` by the difference
+        of the actually consumed capacity units. Negative units are returned
+        to the bucket.
+
+        """
+        with self._lock:
+            self._tokens -= units
+
+    def throttled(self):
+        with self._lock:
+            self._refill()
+            self.rate = max(self.target * self.min_ratio, self.rate / 2)
+
+    def succeeded(self):
+        with self._lock:
+            self._refill()
+            self.rate = min(self.target,
+                            self.rate + self.target * self.recovery_ratio)
+
+    def _refill(self):
+        now = time.time()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RetryPolicy(object):
+    """Retry the throttled and the failed requests with exponential backoff.
+
+    The retries draw from a budget shared by all requests using the policy,
+    so that a failing table is not hammered by the retries of every caller.
+    Each retry costs :attr:`retry_cost` tokens, and each success returns
+    a token to the budget.
+
+    :param max_attempts: the maximum number of attempts per request.
+    :type max_attempts: :class:`int`
+    :param base_delay: the delay in seconds of the first retry.
+    :type base_delay: :class:`numbers.Real`
+    :param max_delay: the upper bound of the delay in seconds.
+    :type max_delay: :class:`numbers.Real`
+    :param retry_budget: the number of tokens in the retry budget.
+    :type retry_budget: :class:`int`
+    :param rate: the requests per second allowed by the client-side token
+                 bucket. It slows the callers down before the table
+                 throttles, and adapts to the throttling. Not limited
+                 if `None`.
+    :type rate: :class:`numbers.Real`
+
+    """
+
+    #: (:class:`int`) The budget tokens taken by a retry.
+    retry_cost = 5
+
+    def __init__(self, max_attempts=5, base_delay=0.05, max_delay=5.0,
+                 retry_budget=500, rate=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_budget = retry_budget
+        self.rate_limiter = RateLimiter(rate) if rate else None
+        self._tokens = retry_budget
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def last_retries(self):
+        """The number of the retries of the last call in this thread."""
+        return getattr(self._local, 'retries', 0)
+
+    def call(self, func, *args, **kwargs):
+        """Call the function, retrying it on the retryable errors."""
+        attempt = 0
+        self._local.retries = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except JSONResponseError as e:
+                throttled = self.is_throttling(e)
+                if throttled and self.rate_limiter:
+                    self.rate_limiter.throttled()
+                attempt += 1
+                if not (throttled or self.is_retryable(e)) or \
+                        attempt >= self.max_attempts or \
+                        not self._withdraw():
+                    raise
+                self._local.retries = attempt
+                time.sleep(backoff_delay(attempt - 1, self.base_delay,
+                                         self.max_delay))
+                continue
+            if self.rate_limiter:
+                self.rate_limiter.succeeded()
+            self._deposit()
+            return result
+
+    def is_throttling(self, error):
+        if isinstance(error, ProvisionedThroughputExceededException):
+            return True
+        body = error.body if isinstance(error.body, dict) else {}
+        return 'ThrottlingException' in body.get('__type', '')
+
+    def is_retryable(self, error):
+        """`True` if the error is transient other than throttling."""
+        return error.status >= 500
+
+    def _withdraw(self):
+        with self._lock:
+            if self._tokens < self.retry_cost:
+                return False
+            self._tokens -= self.retry_cost
+            return True
+
+    def _deposit(self):
+        with self._lock:
+            self._tokens = min(self.retry_budget, self._tokens + 1)
+
+
+class RetryingConnection(object):
+    """Proxy of :class:`boto.dynamodb2.layer1.DynamoDBConnection` which
+    calls the operations through the :class:`RetryPolicy`.
+
+    Since :class:`~bynamodb.results.ResultSet` keeps the last evaluated key
+    of the pages, a retried page resumes the iteration where it stopped.
+
+    """
+
+    def __init__(self, conn, policy):
+        self._conn = conn
+        self._policy = policy
+
+    def __getattr__(self, name):
+        attr = getattr(self._conn, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._policy.call(attr, *args, **kwargs)
+        return call
@@ -0,0 +1,96 @@
+_MISSING = object()
+
+
+class CompactData(object):
+    """Mapping of the attribute values of an item stored in a fixed-layout
+    list indexed by the position of the attribute, instead of a :class:`dict`.
+
+    It is used for the models of which :attr:`~bynamodb.model.Model.compact`
+    is `True`. The subclass for each model is generated by
+    :func:`make_compact_data`.
+
+    """
+
+    __slots__ = ('_values',)
+
+    # (:class:`tuple`) The attribute names in the order of the positions.
+    _names = ()
+
+    # (:class:`dict`) The attribute name to the position.
+    _index = {}
+
+    def __init__(self):
+        self._values = [_MISSING] * len(self._names)
+
+    def get(self, name, default=None):
+        index = self._index.get(name)
+        if index is None:
+            return default
+        value = self._values[index]
+        return default if value is _MISSING else value
+
+    def pop(self, name, *default):
+        index = self._index.get(name)
+        value = _MISSING if index is None else self._values[index]
+        if value is _MISSING:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        self._values[index] = _MISSING
+        return value
+
+    def items(self):
+        return [(name, value)
+                for name, value in zip(self._names, self._values)
+                if value is not _MISSING]
+
+    def keys(self):
+        return [name for name, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def __getitem__(self, name):
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self._values[self._index[name]] = value
+
+    def __delitem__(self, name):
+        self.pop(name)
+
+    def __contains__(self, name):
+        return self.get(name, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.items())
+
+    def __eq__(self, other):
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        # The generated classes cannot be found by their names,
+        # so the values are pickled as a plain dict.
+        return dict, (self.items(),)
+
+
+def make_compact_data(name, attribute_names):
+    """Generate the subclass of :class:`CompactData` for the attributes."""
+    names = tuple(sorted(attribute_names))
+    return type(name, (CompactData,), {
+        '__slots__': (),
+        '_names': names,
+        '_index': dict((attr_name, i) for i, attr_name in enumerate(names))
+    })
@@ -0,0 +1,185 @@
+from .filterexps import AttributeNames, AttributeValues
+
+
+class Action(object):
+    """Abstract actions used in the update expression.
+
+    """
+    #: (:class:`str`) The clause of the action.
+    clause = None
+
+    def build_exp(self, attr_values=None, attr_names=None, attributes=None):
+        """Generate the update expression string, the attribute values and
+        the attribute names used in
+        :class:`boto.dynamodb2.layer1.DynamoDBConnection`.
+
+        :param attr_values: the placeholders of the values shared with
+                            the other expressions of the request.
+        :type attr_values: :class:`~bynamodb.filterexps.AttributeValues`
+        :param attr_names: the placeholders of the names shared with
+                           the other expressions of the request.
+        :type attr_names: :class:`~bynamodb.filterexps.AttributeNames`
+        :param attributes: the attribute name to the
+                           :class:`~bynamodb.attributes.Attribute` encoding
+                           the values of the top-level attributes.
+        :type attributes: :class:`collections.Mapping`
+        """
+        return Update(self).build_exp(attr_values, attr_names, attributes)
+
+    def _build_exp(self, attr_values, attr_names, attributes):
+        raise NotImplementedError
+
+    def __and__(self, action):
+        """Compose the action with another action"""
+        return Update(self, action)
+
+
+class Update(Action):
+    """Update expression of the composed actions."""
+
+    clauses = ('SET', 'REMOVE', 'ADD', 'DELETE')
+
+    def __init__(self, *actions):
+        self.actions = []
+        for action in actions:
+            if isinstance(action, Update):
+                self.actions.extend(action.actions)
+            else:
+                self.actions.append(action)
+
+    def build_exp(self, attr_values=None, attr_names=None, attributes=None):
+        if attr_values is None:
+            attr_values = AttributeValues()
+        if attr_names is None:
+            attr_names = AttributeNames()
+        parts = dict((clause, []) for clause in self.clauses)
+        for action in self.actions:
+            parts[action.clause].append(
+                action._build_exp(attr_values, attr_names, attributes))
+        update_exp = ' '.join(
+            '{0} {1}'.format(clause, ', '.join(parts[clause]))
+            for clause in self.clauses if parts[clause])
+        return update_exp, attr_values.data, attr_names.data
+
+
+class PathAction(Action):
+
+    def __init__(self, path, value=None):
+        self.path = path
+        self.value = value
+
+    def _build_exp(self, attr_values, attr_names, attributes):
+        return '{0} {1}'.format(
+            attr_names.insert_path(self.path),
+            _build_operand(self.value, self.path,
+                           attr_values, attr_names, attributes))
+
+
+class Set(PathAction):
+    """Set the attribute to the value, which may be an :class:`Operand`."""
+    clause = 'SET'
+
+    def _build_exp(self, attr_values, attr_names, attributes):
+        return '{0} = {1}'.format(
+            attr_names.insert_path(self.path),
+            _build_operand(self.value, self.path,
+                           attr_values, attr_names, attributes))
+
+
+class Remove(PathAction):
+    """Remove the attribute, or the element of the list."""
+    clause = 'REMOVE'
+
+    def _build_exp(self, attr_values, attr_names, attributes):
+        return attr_names.insert_path(self.path)
+
+
+class Add(PathAction):
+    """Add the number to the attribute, or the elements to the set."""
+    clause = 'ADD'
+
+
+class Delete(PathAction):
+    """Delete the elements from the set."""
+    clause = 'DELETE'
+
+
+class Operand(object):
+    """Abstract operands of :class:`Set`."""
+
+    def _build_exp(self, attr_values, attr_names, attributes, path):
+        raise NotImplementedError
+
+    def __add__(self, operand):
+        return Arithmetic('+', self, operand)
+
+    def __sub__(self, operand):
+        return Arithmetic('-', self, operand)
+
+
+class Path(Operand):
+    """The value of the attribute."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _build_exp(self, attr_values, attr_names, attributes, path):
+        return attr_names.insert_path(self.path)
+
+
+class Arithmetic(Operand):
+
+    def __init__(self, operator, op1, op2):
+        self.operator = operator
+        self.op1 = op1
+        self.op2 = op2
+
+    def _build_exp(self, attr_values, attr_names, attributes, path):
+        return '{0} {1} {2}'.format(
+            _build_operand(self.op1, path, attr_values, attr_names,
+                           attributes),
+            self.operator,
+            _build_operand(self.op2, path, attr_values, attr_names,
+                           attributes))
+
+
+class IfNotExists(Operand):
+    """The value of the attribute, or the value if it does not exist."""
+
+    def __init__(self, path, value):
+        self.path = path
+        self.value = value
+
+    def _build_exp(self, attr_values, attr_names, attributes, path):
+        return 'if_not_exists({0}, {1})'.format(
+            attr_names.insert_path(self.path),
+            _build_operand(self.value, self.path, attr_values, attr_names,
+                           attributes))
+
+
+class ListAppend(Operand):
+    """Concatenation of the lists."""
+
+    def __init__(self, op1, op2):
+        self.op1 = op1
+        self.op2 = op2
+
+    def _build_exp(self, attr_values, attr_names, attributes, path):
+        return 'list_append({0}, {1})'.format(
+            _build_operand(self.op1, path, attr_values, attr_names,
+                           attributes),
+            _build_operand(self.op2, path, attr_values, attr_names,
+                           attributes))
+
+
+def _build_operand(value, path, attr_values, attr_names, attributes):
+    """Build the operand, inserting the plain value encoded by
+    the attribute of the `path`.
+
+    """
+    if isinstance(value, Operand):
+        return value._build_exp(attr_values, attr_names, attributes, path)
+    attribute = None
+    if attributes:
+        attribute = attributes.get(path)
+    return attr_values.insert(value, attribute)
@@ -5,6 +5,11 @@ from bynamodb.version import VERSION
 
 install_requires = ['boto']
 
+extras_require = {
+    # The columnar export of the results.
+    'numpy': ['numpy'],
+}
+
 setup(
     name='bynamodb',
     version=VERSION,
@@ -15,5 +20,6 @@ setup(
     description='High-Level DynamoDB Interface for Python'
                 'wrapping Low-Level Interface of boto',
     install_requires=install_requires,
+    extras_require=extras_require,
     packages=find_packages(exclude=['tests'])
 )
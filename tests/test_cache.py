@@ -0,0 +1,65 @@
+import time
+
+from _pytest.python import fixture
+
+from bynamodb.attributes import StringAttribute
+from bynamodb.cache import LRUCache
+from bynamodb.model import Model
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.hits == 3
+    assert cache.misses == 1
+
+
+def test_lru_cache_expires():
+    cache = LRUCache(ttl=0.01)
+    cache.set('a', 1)
+    time.sleep(0.02)
+    assert cache.get('a') is None
+
+
+@fixture
+def fx_cached_model():
+    class CachedModel(Model):
+        hash_key = StringAttribute(hash_key=True)
+        attr = StringAttribute(null=True)
+        cache = LRUCache()
+    CachedModel.create_table()
+    return CachedModel
+
+
+def test_get_item_reads_through_cache(fx_cached_model):
+    fx_cached_model.put_item(hash_key='1', attr='a')
+    assert fx_cached_model.get_item('1').attr == 'a'
+    assert fx_cached_model.cache.hits == 1
+
+    fx_cached_model.update_item('1', attributes_to_set={'attr': 'b'})
+    assert fx_cached_model.get_item('1').attr == 'b'
+    assert fx_cached_model.cache.misses == 1
+
+    fx_cached_model.get_item('1').delete()
+    assert len(fx_cached_model.cache) == 0
+
+
+def test_batch_get_reads_through_cache(fx_cached_model):
+    with fx_cached_model.batch_write() as batch:
+        for i in range(10):
+            batch.put_item(hash_key=str(i))
+    assert len(fx_cached_model.cache) == 10
+    fx_cached_model.cache.clear()
+
+    fx_cached_model.get_item('0')
+    keys = [(str(i),) for i in range(10)]
+    items = list(fx_cached_model.batch_get(*keys, ordered=True))
+    assert [item.hash_key for item in items] == [str(i) for i in range(10)]
+    assert fx_cached_model.cache.hits == 1
+    assert len(fx_cached_model.cache) == 10
@@ -0,0 +1,63 @@
+from _pytest.python import fixture
+
+from bynamodb.attributes import StringAttribute
+from bynamodb.capacity import (CapacityCounter, add_listener, capacity_units,
+                               remove_listener)
+from bynamodb.model import Model
+
+
+def test_capacity_units():
+    assert capacity_units(None) == 0
+    assert capacity_units({'TableName': 'A', 'CapacityUnits': 1.5}) == 1.5
+    assert capacity_units([{'TableName': 'A', 'CapacityUnits': 1.0},
+                           {'TableName': 'B', 'CapacityUnits': 2.0}]) == 3.0
+
+
+def test_capacity_counter():
+    counter = CapacityCounter()
+    counter('query', {
+        'TableName': 'Table',
+        'CapacityUnits': 3.0,
+        'GlobalSecondaryIndexes': {'Index': {'CapacityUnits': 2.0}}
+    })
+    counter('get_item', {'TableName': 'Table', 'CapacityUnits': 0.5})
+    assert counter.tables['Table'] == 3.5
+    assert counter.indexes[('Table', 'Index')] == 2.0
+    assert counter.operations[('Table', 'query')] == 3.0
+
+
+@fixture
+def fx_capacity_counter(request):
+    counter = CapacityCounter()
+    add_listener(counter)
+    request.addfinalizer(lambda: remove_listener(counter))
+    return counter
+
+
+@fixture
+def fx_model_returning_capacity():
+    class CapacityModel(Model):
+        return_consumed_capacity = 'TOTAL'
+        hash_key = StringAttribute(hash_key=True)
+        range_key = StringAttribute(range_key=True)
+    CapacityModel.create_table()
+    return CapacityModel
+
+
+def test_consumed_capacity(fx_model_returning_capacity, fx_capacity_counter):
+    for i in range(5):
+        fx_model_returning_capacity.put_item(hash_key='1', range_key=str(i))
+    table_name = fx_model_returning_capacity.get_table_name()
+    assert fx_capacity_counter.operations[(table_name, 'put_item')] > 0
+
+    result = fx_model_returning_capacity.query(hash_key__eq='1')
+    assert len(list(result)) == 5
+    assert result.consumed_capacity > 0
+    assert fx_capacity_counter.operations[(table_name, 'query')] == \
+        result.consumed_capacity
+
+    consumed = result.consumed_capacity
+    assert len(list(result)) == 5
+    assert result.consumed_capacity == consumed
+    result.count()
+    assert 0 < result.consumed_capacity <= consumed
@@ -0,0 +1,55 @@
+from _pytest.python import fixture
+from pytest import importorskip
+
+from bynamodb.attributes import (BooleanAttribute, NumberAttribute,
+                                 StringAttribute)
+from bynamodb.columns import to_columns
+from bynamodb.model import Model
+
+
+numpy = importorskip('numpy')
+
+
+@fixture
+def fx_column_model():
+    class ColumnModel(Model):
+        hash_key = StringAttribute(hash_key=True)
+        number = NumberAttribute(null=True)
+        flag = BooleanAttribute(null=True)
+    ColumnModel.create_table()
+    for i in range(10):
+        ColumnModel.put_item(hash_key=str(i), number=i,
+                             flag=i % 2 == 0 if i < 5 else None)
+    return ColumnModel
+
+
+def test_to_columns(fx_column_model):
+    columns = fx_column_model.scan().to_columns()
+    assert set(columns) == {'hash_key', 'number', 'flag'}
+    assert columns['number'].dtype == numpy.int64
+    assert columns['number'].sum() == 45
+    assert columns['flag'].dtype == numpy.bool_
+    assert columns['flag'].count() == 5
+
+
+def test_iter_columns(fx_column_model):
+    chunks = list(fx_column_model.scan().iter_columns(chunk_size=4))
+    assert [len(chunk['hash_key']) for chunk in chunks] == [4, 4, 2]
+
+
+def test_number_columns(fx_column_model):
+    items_raw = [{'number': {'N': str(2 ** 53 + 1)}}, {}]
+    columns = to_columns(fx_column_model, items_raw, ['number'])
+    assert columns['number'].dtype == numpy.int64
+    assert columns['number'][0] == 2 ** 53 + 1
+    assert columns['number'].mask.tolist() == [False, True]
+
+    items_raw = [{'number': {'N': str(2 ** 64)}}, {'number': {'N': '1'}}]
+    column = to_columns(fx_column_model, items_raw, ['number'])['number']
+    assert column.dtype == object
+    assert column[0] == 2 ** 64
+
+    items_raw = [{'number': {'N': '1.5'}}, {'number': {'N': '1'}}]
+    column = to_columns(fx_column_model, items_raw, ['number'])['number']
+    assert column.dtype == numpy.float64
+    assert column.sum() == 2.5
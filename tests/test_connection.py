@@ -0,0 +1,76 @@
+from _pytest.python import raises
+from boto.dynamodb2.layer1 import DynamoDBConnection
+
+from bynamodb.connection import (ConnectionManager, ConnectionPool,
+                                 ThreadLocalConnectionManager)
+from bynamodb.exceptions import ConnectionPoolTimeoutException
+from bynamodb.model import Model
+from bynamodb.patcher import patch_connection_manager, patch_retry_policy
+from bynamodb.retry import RetryPolicy
+
+
+def test_connection_manager_shares_connection():
+    manager = ConnectionManager()
+    assert manager.get_connection() is manager.get_connection()
+
+
+def test_thread_local_connection_manager():
+    manager = ThreadLocalConnectionManager()
+    assert manager.get_connection() is manager.get_connection()
+
+
+def test_connection_pool():
+    pool = ConnectionPool(size=2)
+    assert 'TableNames' in pool.get_connection().list_tables()
+    with pool.checkout() as conn1:
+        with pool.checkout() as conn2:
+            assert conn1 is not conn2
+    with pool.checkout() as conn:
+        assert conn in (conn1, conn2)
+
+
+def test_connection_pool_timeout():
+    pool = ConnectionPool(size=1, timeout=0.1)
+    with pool.checkout():
+        with raises(ConnectionPoolTimeoutException):
+            with pool.checkout():
+                pass
+
+
+def test_connection_manager_reset():
+    manager = ConnectionManager()
+    conn = manager.get_connection()
+    manager.reset()
+    assert manager.get_connection() is not conn
+
+
+def test_retry_policy_disables_connection_retries():
+    original = Model._connection_manager
+    manager = ConnectionManager()
+    patch_connection_manager(manager)
+    try:
+        assert manager.get_connection().NumberRetries == \
+            DynamoDBConnection.NumberRetries
+        patch_retry_policy(RetryPolicy())
+        assert manager.get_connection().NumberRetries == 0
+        pool = ConnectionPool(size=1)
+        patch_connection_manager(pool)
+        with pool.checkout() as conn:
+            assert conn.NumberRetries == 0
+    finally:
+        patch_retry_policy(None)
+        patch_connection_manager(original)
+
+
+def test_retry_policy_with_custom_connection_manager():
+    class CustomConnectionManager(object):
+        def get_connection(self):
+            return DynamoDBConnection()
+
+    original = Model._connection_manager
+    patch_connection_manager(CustomConnectionManager())
+    try:
+        patch_retry_policy(RetryPolicy())
+    finally:
+        patch_retry_policy(None)
+        patch_connection_manager(original)
@@ -1,6 +1,7 @@
 from _pytest.python import fixture
 
-from bynamodb.filterexps import Contains, GT, OR
+from bynamodb.filterexps import (AttributeExists, AttributeNames,
+                                 AttributeNotExists, Contains, GT, OR)
 
 
 @fixture
@@ -39,3 +40,17 @@ def test_nest_or(fx_test_contain_operator, fx_test_gt_operator):
     assert filter_exp == '(contains(content, :1) or birth_year > :2)'
     assert attr_values[':1'] == {'S': 'keyword'}
     assert attr_values[':2'] == {'N': '1994'}
+
+
+def test_build_attribute_exists():
+    filter_exp, attr_values = \
+        (AttributeExists('a') & AttributeNotExists('b')).build_exp()
+    assert filter_exp == '(attribute_exists(a) and attribute_not_exists(b))'
+    assert attr_values == {}
+
+
+def test_build_with_attribute_names(fx_test_gt_operator):
+    attr_names = AttributeNames()
+    filter_exp, _ = fx_test_gt_operator.build_exp(attr_names=attr_names)
+    assert filter_exp == '#1 > :1'
+    assert attr_names.data == {'#1': 'birth_year'}
@@ -0,0 +1,93 @@
+import json
+
+from _pytest.python import fixture
+
+from bynamodb.attributes import StringAttribute
+from bynamodb.hooks import (Histogram, HistogramCollector, _get_table_name,
+                            add_after_request, add_before_request,
+                            remove_after_request, remove_before_request)
+from bynamodb.model import Model, batch_get
+
+
+def test_table_name_of_transaction():
+    body = json.dumps({'TransactItems': [
+        {'Put': {'TableName': 'B', 'Item': {}}},
+        {'Delete': {'TableName': 'A', 'Key': {}}},
+        {'ConditionCheck': {'TableName': 'B', 'Key': {}}},
+    ]})
+    assert _get_table_name('transact_write_items',
+                           ('TransactWriteItems', body)) == 'A,B'
+
+
+def test_histogram():
+    histogram = Histogram()
+    histogram.observe(0.003)
+    histogram.observe(0.2)
+    histogram.observe(20)
+    assert histogram.count == 3
+    assert histogram.counts[0] == 1
+    assert histogram.counts[Histogram.buckets.index(0.25)] == 2
+    assert histogram.sum == 20.203
+
+
+@fixture
+def fx_collector(request):
+    collector = HistogramCollector()
+    events = []
+    add_before_request(events.append)
+    add_after_request(collector)
+
+    def fin():
+        remove_before_request(events.append)
+        remove_after_request(collector)
+
+    request.addfinalizer(fin)
+    return collector, events
+
+
+@fixture
+def fx_hooked_model():
+    class HookedModel(Model):
+        hash_key = StringAttribute(hash_key=True)
+        range_key = StringAttribute(range_key=True)
+    HookedModel.create_table()
+    return HookedModel
+
+
+def test_request_hooks(fx_hooked_model, fx_collector):
+    collector, events = fx_collector
+    for i in range(3):
+        fx_hooked_model.put_item(hash_key='1', range_key=str(i))
+    result = fx_hooked_model.query(hash_key__eq='1')
+    assert len(list(result)) == 3
+    assert result.pages_fetched == 1
+
+    table_name = fx_hooked_model.get_table_name()
+    assert [event.operation for event in events] == ['put_item'] * 3 + \
+        ['query']
+    key = ('query', table_name, None)
+    assert collector.latency[key].count == 1
+    assert collector.counters[key]['items'] == 3
+    assert collector.counters[key]['decoded_items'] == 3
+    assert collector.counters[key]['response_bytes'] > 0
+    assert collector.decode_time[key].count == 1
+
+
+def test_get_item_decode_hook(fx_hooked_model, fx_collector):
+    collector, _ = fx_collector
+    fx_hooked_model.put_item(hash_key='1', range_key='1')
+    fx_hooked_model.get_item('1', '1')
+    key = ('get_item', fx_hooked_model.get_table_name(), None)
+    assert collector.counters[key]['decoded_items'] == 1
+    assert collector.decode_time[key].count == 1
+
+
+def test_multi_model_batch_get_decode_hook(fx_hooked_model, fx_collector):
+    collector, _ = fx_collector
+    fx_hooked_model.put_item(hash_key='1', range_key='1')
+    fx_hooked_model.put_item(hash_key='1', range_key='2')
+    items = batch_get((fx_hooked_model, '1', '1'), (fx_hooked_model, '1', '2'))
+    assert [item.range_key for item in items] == ['1', '2']
+    key = ('batch_get_item', fx_hooked_model.get_table_name(), None)
+    assert collector.counters[key]['decoded_items'] == 2
+    assert collector.decode_time[key].count == 1
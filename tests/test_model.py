@@ -1,14 +1,21 @@
+import pickle
+
 from _pytest.python import raises, fixture
+from boto.dynamodb2.exceptions import ConditionalCheckFailedException
 from boto.dynamodb2.layer1 import DynamoDBConnection
 
 from bynamodb.attributes import (NumberAttribute, StringAttribute,
                                  StringSetAttribute, ListAttribute,
-                                 MapAttribute)
-from bynamodb.exceptions import NullAttributeException, ItemNotFoundException
-from bynamodb.filterexps import GT
+                                 MapAttribute, VersionAttribute)
+from bynamodb.connection import ConnectionManager
+from bynamodb.exceptions import (NullAttributeException, ItemNotFoundException,
+                                 PartialItemException)
+from bynamodb.filterexps import AttributeNotExists, EQ, GT
 from bynamodb.indexes import GlobalAllIndex, AllIndex
 from bynamodb.patcher import patch_table_name_prefix
-from bynamodb.model import Model
+from bynamodb.model import (BatchWrite, Model, Transaction, batch_get,
+                            batch_write, transact_get)
+from bynamodb.updateexps import Remove
 
 
 @fixture
@@ -48,6 +55,15 @@ def test_table_attr_name(fx_test_model):
     assert fx_test_model.attr_1.attr_name == 'attr_1'
 
 
+def test_init_sets_attributes_only(fx_test_model):
+    item = fx_test_model(hash_key_attr='hash', _data={}, _dirty=set(),
+                         save='value')
+    assert item.hash_key_attr == 'hash'
+    assert item._data == {'hash_key_attr': 'hash'}
+    assert item._dirty is None
+    assert callable(item.save)
+
+
 def test_create_table(fx_test_model):
     fx_test_model.create_table()
     table_description = DynamoDBConnection().describe_table(
@@ -160,6 +176,204 @@ def test_delete_item(fx_test_model):
         fx_test_model.get_item(hash_key_value, range_key_value)
 
 
+def test_update_item(fx_test_model):
+    fx_test_model.create_table()
+    fx_test_model.put_item(hash_key_attr='hash', range_key_attr='range',
+                           attr_1='value')
+    item = fx_test_model.update_item(
+        'hash', 'range', attributes_to_set={'attr_1': 'new value'},
+        return_values='ALL_NEW')
+    assert item.attr_1 == 'new value'
+    assert item.range_key_attr == 'range'
+
+    assert fx_test_model.update_item(
+        'hash', 'range', update_builder=Remove('attr_1')) is None
+    assert fx_test_model.get_item('hash', 'range').attr_1 is None
+
+
+def test_conditional_writes(fx_test_model):
+    fx_test_model.create_table()
+    not_exists = AttributeNotExists('hash_key_attr')
+    fx_test_model.put_item(hash_key_attr='hash', range_key_attr='range',
+                           attr_1='value', condition_builder=not_exists)
+    with raises(ConditionalCheckFailedException):
+        fx_test_model.put_item(hash_key_attr='hash', range_key_attr='range',
+                               attr_1='other', condition_builder=not_exists)
+    with raises(ConditionalCheckFailedException):
+        fx_test_model.update_item('hash', 'range',
+                                  attributes_to_set={'attr_1': 'other'},
+                                  condition_builder=EQ('attr_1', 'other'))
+    item = fx_test_model.get_item('hash', 'range')
+    assert item.attr_1 == 'value'
+    with raises(ConditionalCheckFailedException):
+        item.delete(condition_builder=EQ('attr_1', 'other'))
+    item.delete(condition_builder=EQ('attr_1', 'value'))
+
+
+@fixture
+def fx_versioned_model():
+    class VersionedModel(Model):
+        hash_key = StringAttribute(hash_key=True)
+        attr = StringAttribute(null=True)
+        version = VersionAttribute()
+    VersionedModel.create_table()
+    return VersionedModel
+
+
+def test_version_attribute(fx_versioned_model):
+    item = fx_versioned_model(hash_key='1', attr='value')
+    item.save()
+    assert item.version == 1
+    with raises(ConditionalCheckFailedException):
+        fx_versioned_model(hash_key='1').save()
+
+    first = fx_versioned_model.get_item('1')
+    second = fx_versioned_model.get_item('1')
+    first.attr = 'first'
+    first.save()
+    assert first.version == 2
+    second.attr = 'second'
+    with raises(ConditionalCheckFailedException):
+        second.save()
+    assert second.version == 1
+
+    fx_versioned_model.update_item('1', attributes_to_set={'attr': 'third'})
+    assert fx_versioned_model.get_item('1').version == 3
+    with raises(ConditionalCheckFailedException):
+        first.delete()
+
+
+def test_version_attribute_of_lazily_decoded_item(fx_versioned_model):
+    fx_versioned_model.lazy_decode = True
+    fx_versioned_model(hash_key='1', attr='value').save()
+    item = fx_versioned_model.get_item('1')
+    item.attr = 'new value'
+    item.save()
+    assert fx_versioned_model.get_item('1').version == 2
+    fx_versioned_model.get_item('1').delete()
+    with raises(ItemNotFoundException):
+        fx_versioned_model.get_item('1')
+
+
+def test_transaction_collects_writes(fx_versioned_model,
+                                     fx_query_test_model):
+    transaction = Transaction()
+    transaction.put(fx_versioned_model(hash_key='1', attr='value'))
+    transaction.update(fx_versioned_model, '2',
+                       update_builder=Remove('attr'))
+    transaction.condition_check(fx_versioned_model, '3',
+                                condition_builder=EQ('attr', 'value'))
+    put, update, check = transaction._items
+    assert put['Put']['Item']['version'] == {'N': '1'}
+    assert put['Put']['ConditionExpression'] == 'attribute_not_exists(#1)'
+    assert update['Update']['UpdateExpression'] == 'REMOVE #1 ADD #2 :1'
+    assert check['ConditionCheck']['Key'] == {'hash_key': {'S': '3'}}
+    with raises(ValueError):
+        Transaction().update(fx_query_test_model, '1', '1')
+    with raises(ValueError):
+        Transaction().condition_check(fx_versioned_model, '3')
+    with raises(ValueError):
+        transact_get(*[(fx_versioned_model, str(i)) for i in range(101)])
+    transaction.max_items = 3
+    with raises(ValueError):
+        transaction.condition_check(fx_versioned_model, '4',
+                                    condition_builder=EQ('attr', 'value'))
+
+
+def test_aput_item_and_aget_item(fx_test_model):
+    fx_test_model.create_table()
+    fx_test_model.aput_item(
+        hash_key_attr='hash',
+        range_key_attr='range',
+        attr_1='value'
+    ).get()
+    item = fx_test_model.aget_item('hash', 'range').get()
+    assert item.attr_1 == 'value'
+    items = fx_test_model.aquery(hash_key_attr__eq='hash').get()
+    assert [item.range_key_attr for item in items] == ['range']
+
+
+def test_get_item_with_projection(fx_test_model):
+    fx_test_model.create_table()
+    fx_test_model.put_item(
+        hash_key_attr='hash',
+        range_key_attr='range',
+        attr_1='value'
+    )
+    item = fx_test_model.get_item('hash', 'range', attributes=['attr_1'])
+    assert item.attr_1 == 'value'
+    assert item.hash_key_attr == 'hash'
+    assert item.is_loaded('attr_1')
+
+    item = fx_test_model.get_item('hash', 'range',
+                                  attributes=['range_key_attr'])
+    assert item.attr_1 is None
+    assert not item.is_loaded('attr_1')
+    item.range_key_attr = 'other range'
+    with raises(PartialItemException):
+        item.save()
+
+
+def test_save_updates_dirty_attributes(fx_test_model):
+    fx_test_model.create_table()
+    fx_test_model.put_item(hash_key_attr='hash', range_key_attr='range',
+                           attr_1='value')
+    item = fx_test_model.get_item('hash', 'range',
+                                  attributes=['range_key_attr'])
+    assert not item.is_dirty()
+    item.attr_1 = 'new value'
+    assert item.is_dirty('attr_1')
+    item.save()
+    assert not item.is_dirty()
+    assert fx_test_model.get_item('hash', 'range').attr_1 == 'new value'
+
+    item = fx_test_model(hash_key_attr='hash', range_key_attr='new')
+    assert item.is_dirty()
+
+
+def test_save_updates_lazily_decoded_item(fx_test_model):
+    fx_test_model.create_table()
+    fx_test_model.put_item(hash_key_attr='hash', range_key_attr='range',
+                           attr_1='value')
+    fx_test_model.lazy_decode = True
+    item = fx_test_model.get_item('hash', 'range')
+    item.attr_1 = 'new value'
+    item.save()
+    assert fx_test_model.get_item('hash', 'range').attr_1 == 'new value'
+
+
+def test_query_with_projection(fx_test_model):
+    fx_test_model.create_table()
+    for i in range(3):
+        fx_test_model.put_item(
+            hash_key_attr='hash',
+            range_key_attr=str(i),
+            attr_1='value'
+        )
+    result = fx_test_model.query(hash_key_attr__eq='hash',
+                                 attributes=['hash_key_attr'])
+    assert result.count() == 3
+    items = list(result)
+    assert [item.range_key_attr for item in items] == ['0', '1', '2']
+    assert all(item.attr_1 is None for item in items)
+
+
+def test_count_with_projection_keeps_other_names(fx_test_model):
+    result = fx_test_model.query(hash_key_attr__eq='hash',
+                                 attributes=['attr_1'])
+    result.kwargs['expression_attribute_names']['#pk'] = 'hash_key_attr'
+    requests = []
+
+    def request(operation, table_name, **kwargs):
+        requests.append(kwargs)
+        return {'Count': 0}
+    fx_test_model._request = staticmethod(request)
+    assert result.count() == 0
+    assert 'projection_expression' not in requests[0]
+    assert requests[0]['expression_attribute_names'] == \
+        {'#pk': 'hash_key_attr'}
+
+
 def test_put_item_with_missing_attr(fx_test_model):
     fx_test_model.create_table()
     attrs = {
@@ -196,6 +410,95 @@ def test_model_default_attr(fx_model_with_default_attr):
     assert item.attr == 'Default value'
 
 
+def test_from_raw_data(fx_model_with_default_attr):
+    item = fx_model_with_default_attr.from_raw_data({
+        'hash_key': {'S': 'value'},
+        'unknown': {'S': 'unknown'}
+    })
+    assert item.hash_key == 'value'
+    assert item.attr == 'Default value'
+    assert not hasattr(item, 'unknown')
+
+
+def test_serialize(fx_model_with_default_attr):
+    item = fx_model_with_default_attr(hash_key='value')
+    assert item._serialize() == item.serialize() == {
+        'hash_key': {'S': 'value'},
+        'attr': {'S': 'Default value'}
+    }
+
+
+def test_from_raw_data_lazily(fx_model_with_default_attr):
+    item = fx_model_with_default_attr.from_raw_data({
+        'hash_key': {'S': 'value'},
+        'attr': {'S': 'raw value'}
+    }, lazy=True)
+    assert item._data == {}
+    assert item._serialize() == {
+        'hash_key': {'S': 'value'},
+        'attr': {'S': 'raw value'}
+    }
+    assert item.attr == 'raw value'
+    assert item._data == {'attr': 'raw value'}
+    item.attr = 'new value'
+    assert item._serialize()['attr'] == {'S': 'new value'}
+
+
+@fixture
+def fx_compact_model():
+    class CompactModel(Model):
+        compact = True
+        hash_key = StringAttribute(hash_key=True)
+        attr = StringAttribute(default='Default value')
+        number = NumberAttribute(null=True)
+    CompactModel.create_table()
+    return CompactModel
+
+
+def test_compact_model(fx_compact_model):
+    item = fx_compact_model.put_item(hash_key='1', number=1)
+    assert not hasattr(item, '__dict__')
+    with raises(AttributeError):
+        item.unknown = 'value'
+
+    item = fx_compact_model.get_item('1')
+    assert not hasattr(item, '__dict__')
+    assert item._data == {'hash_key': '1', 'attr': 'Default value',
+                          'number': 1}
+    item.number = None
+    item.save()
+    assert fx_compact_model.get_item('1').number is None
+
+
+class PickledModel(Model):
+    hash_key = StringAttribute(hash_key=True)
+    attr = StringAttribute(null=True)
+    tags = StringSetAttribute(null=True)
+
+
+class CompactPickledModel(Model):
+    compact = True
+    hash_key = StringAttribute(hash_key=True)
+    attr = StringAttribute(null=True)
+    tags = StringSetAttribute(null=True)
+
+
+def test_pickle_item():
+    for model in (PickledModel, CompactPickledModel):
+        item = model.from_raw_data(
+            {'hash_key': {'S': '1'}, 'attr': {'S': 'value'}}, lazy=True)
+        item.tags = set(['tag'])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copied = pickle.loads(pickle.dumps(item, protocol))
+            assert type(copied) is model
+            assert type(copied._data) is model._data_class
+            assert copied.hash_key == '1'
+            assert copied.attr == 'value'
+            assert copied.tags == set(['tag'])
+            assert copied.is_dirty('tags')
+            assert not copied.is_dirty('attr')
+
+
 @fixture
 def fx_model_with_nullable_attr():
     class TestModelWithNullable(Model):
@@ -266,6 +569,34 @@ def test_query_limit(fx_query_test_model, fx_query_test_items):
     assert list(result)[0].title == '00000'
 
 
+def test_query_resume_from_token(fx_query_test_model, fx_query_test_items):
+    tokens = []
+    result = fx_query_test_model.query(limit=1, checkpoint=tokens.append,
+                                       published_at__eq='aaaaa')
+    assert [item.title for item in result] == ['00000']
+    assert result.cursor is not None
+    assert tokens == [result.token]
+
+    rest = fx_query_test_model.query(start_token=result.token,
+                                     published_at__eq='aaaaa')
+    assert [item.title for item in rest] == ['11111']
+    assert rest.cursor is None
+    assert rest.token is None
+
+
+def test_query_pages(fx_query_test_model, fx_query_test_items):
+    result = fx_query_test_model.query(limit=3, page_size=1,
+                                       published_at__eq='aaaaa')
+    pages = list(result.pages())
+    assert [item.title for page in pages for item in page] == \
+        ['00000', '11111']
+    assert all(len(page) == page.count <= 1 for page in pages)
+    assert pages[0].last_evaluated_key is not None
+    assert pages[-1].last_evaluated_key is None
+    raw_pages = list(result.pages(raw=True))
+    assert raw_pages[0].items[0]['title'] == {'S': '00000'}
+
+
 @fixture
 def fx_batch_get_test_items(fx_query_test_model):
     for i in range(200):
@@ -278,6 +609,54 @@ def test_batch_get(fx_query_test_model, fx_batch_get_test_items):
     assert len(items) == 200
 
 
+def test_batch_get_concurrently(fx_query_test_model, fx_batch_get_test_items):
+    keys = [(str(i), str(i)) for i in range(200)]
+    items = list(fx_query_test_model.batch_get(*keys, workers=2))
+    assert len(items) == 200
+
+
+def test_batch_get_ordered(fx_query_test_model, fx_batch_get_test_items):
+    keys = [(str(i), str(i)) for i in reversed(range(200))]
+    keys.append(('0', '0'))
+    keys.append(('missing', 'missing'))
+    items = list(fx_query_test_model.batch_get(*keys, ordered=True))
+    assert [item.title for item in items] == \
+        [str(i) for i in reversed(range(200))]
+
+
+def test_batch_get_unknown_option(fx_query_test_model):
+    with raises(TypeError):
+        list(fx_query_test_model.batch_get(('0', '0'), projecton=['title']))
+
+
+def test_scan_prefetch(fx_query_test_model, fx_batch_get_test_items):
+    result = fx_query_test_model.scan(prefetch=2)
+    assert len(list(result)) == 200
+
+
+def test_parallel_scan(fx_query_test_model, fx_batch_get_test_items):
+    result = fx_query_test_model.scan(total_segments=4, workers=2)
+    items = list(result)
+    assert len(items) == 200
+    assert len(set(item.title for item in items)) == 200
+    assert result.count() == 200
+    assert sum(result.counts()) == 200
+    assert not result.failures
+
+
+def test_parallel_scan_ordered(fx_query_test_model, fx_batch_get_test_items):
+    result = fx_query_test_model.scan(total_segments=4, ordered=True)
+    expected = [item.title
+                for segment in result.segments() for item in segment]
+    assert [item.title for item in result] == expected
+
+
+def test_scan_segment(fx_query_test_model, fx_batch_get_test_items):
+    counts = [fx_query_test_model.scan(segment=i, total_segments=3).count()
+              for i in range(3)]
+    assert sum(counts) == 200
+
+
 def test_batch_write(fx_query_test_model):
 
     with fx_query_test_model.batch_write() as batch:
@@ -298,6 +677,95 @@ def test_batch_write(fx_query_test_model):
             batch.put_item(published_at=500)
 
 
+def test_batch_write_concurrently(fx_query_test_model):
+    with fx_query_test_model.batch_write(workers=4,
+                                         write_capacity=1000) as batch:
+        for i in range(200):
+            batch.put_item(published_at=str(i), title=str(i))
+    assert fx_query_test_model.scan().count() == 200
+
+
+def test_batch_write_concurrently_in_order(fx_query_test_model):
+    with fx_query_test_model.batch_write(workers=2, flush_at=25) as batch:
+        for i in range(25):
+            batch.put_item(published_at=str(i), title=str(i))
+        assert len(batch._in_flight) == 1
+        for i in range(25):
+            batch.delete_item(str(i), str(i))
+        assert len(batch._in_flight) == 1
+    assert fx_query_test_model.scan().count() == 0
+
+
+def test_batch_write_flushes_as_it_fills(fx_query_test_model):
+    with fx_query_test_model.batch_write() as batch:
+        for i in range(60):
+            batch.put_item(published_at=str(i), title=str(i))
+        assert len(batch.to_put) == 10
+        assert fx_query_test_model.scan().count() == 50
+    assert fx_query_test_model.scan().count() == 60
+
+
+def test_batch_write_collapses_duplicate_keys(fx_query_test_model):
+    with fx_query_test_model.batch_write() as batch:
+        batch.put_item(published_at='1', title='1')
+        batch.delete_item('1', '1')
+        batch.put_item(published_at='1', title='1')
+        assert len(batch.to_put) == 1
+        assert not batch.to_delete
+    assert fx_query_test_model.scan().count() == 1
+
+
+def test_multi_model_batch(fx_query_test_model, fx_versioned_model):
+    with batch_write() as batch:
+        for i in range(30):
+            batch.put(fx_query_test_model(published_at=str(i), title=str(i)))
+            batch.put(fx_versioned_model(hash_key=str(i), attr=str(i)))
+        batch.delete(fx_query_test_model, '0', '0')
+    assert fx_query_test_model.scan().count() == 29
+    assert fx_versioned_model.scan().count() == 30
+
+    items = batch_get((fx_versioned_model, '1'),
+                      (fx_query_test_model, '1', '1'),
+                      (fx_query_test_model, '0', '0'),
+                      (fx_versioned_model, '1'))
+    assert type(items[0]) is fx_versioned_model
+    assert items[0].attr == '1'
+    assert type(items[1]) is fx_query_test_model
+    assert items[1].title == '1'
+    assert items[2] is None
+    assert items[3].hash_key == '1'
+    with raises(TypeError):
+        batch_get((fx_versioned_model, '1'), worker=2)
+    with raises(ValueError):
+        BatchWrite().put_item(hash_key='1')
+
+
+def test_multi_model_batch_connections(fx_query_test_model):
+    class CountingConnectionManager(ConnectionManager):
+        requests = 0
+
+        def get_connection(self):
+            self.requests += 1
+            return super(CountingConnectionManager, self).get_connection()
+
+    class ModelWithConnection(Model):
+        _connection_manager = CountingConnectionManager()
+        hash_key = StringAttribute(hash_key=True)
+    ModelWithConnection.create_table()
+    manager = ModelWithConnection._connection_manager
+    manager.requests = 0
+
+    with batch_write() as batch:
+        batch.put(fx_query_test_model(published_at='1', title='1'))
+        batch.put(ModelWithConnection(hash_key='1'))
+    assert manager.requests == 1
+    items = batch_get((fx_query_test_model, '1', '1'),
+                      (ModelWithConnection, '1'))
+    assert manager.requests == 2
+    assert items[0].title == '1'
+    assert items[1].hash_key == '1'
+
+
 @fixture
 def fx_model_with_set_attr():
     class TestModel(Model):
@@ -317,6 +785,27 @@ def test_model_with_set_attr(fx_model_with_set_attr):
     assert item.attr == {'1', '2'}
 
 
+def test_set_attribute_saved_in_place(fx_model_with_set_attr):
+    fx_model_with_set_attr.put_item(hash_key='1', attr={'a'})
+    item = fx_model_with_set_attr.get_item('1')
+    item.attr.add('b')
+    assert item.is_dirty('attr')
+    item.save()
+    assert fx_model_with_set_attr.get_item('1').attr == {'a', 'b'}
+    item.attr.clear()
+    item.save()
+    assert fx_model_with_set_attr.get_item('1').attr == set()
+
+
+def test_read_set_attribute_not_dirty(fx_model_with_set_attr):
+    fx_model_with_set_attr.put_item(hash_key='1', attr={'a'})
+    item = fx_model_with_set_attr.get_item('1')
+    assert item.attr == {'a'}
+    assert not item.is_dirty()
+    item.attr.add('b')
+    assert item.is_dirty('attr')
+
+
 def test_default_set_not_modified(fx_model_with_set_attr):
     item = fx_model_with_set_attr(hash_key='hash_key')
     item.attr.add('value')
@@ -0,0 +1,54 @@
+import operator
+import os
+
+from _pytest.python import fixture, raises
+
+from bynamodb.attributes import NumberAttribute, StringAttribute
+from bynamodb.exceptions import SegmentScanException
+from bynamodb.model import Model
+from bynamodb.pipeline import scan_map, scan_reduce
+
+
+@fixture
+def fx_pipeline_test_model():
+    class PipelineTestModel(Model):
+        id = StringAttribute(hash_key=True)
+        value = NumberAttribute()
+    PipelineTestModel.create_table()
+    for i in range(100):
+        PipelineTestModel.put_item(id=str(i), value=i + 1)
+    return PipelineTestModel
+
+
+def test_scan_map(fx_pipeline_test_model):
+    values = scan_map(fx_pipeline_test_model, lambda item: item.value,
+                      total_segments=4, processes=2, page_size=10)
+    assert sorted(values) == range(1, 101)
+
+
+def test_scan_reduce(fx_pipeline_test_model):
+    total = scan_reduce(fx_pipeline_test_model, lambda item: item.value,
+                        operator.add, 0, total_segments=4, processes=2)
+    assert total == sum(range(1, 101))
+
+
+def test_scan_map_failure(fx_pipeline_test_model):
+    def fail(item):
+        raise ValueError(item.id)
+    with raises(SegmentScanException) as e:
+        list(scan_map(fx_pipeline_test_model, fail, total_segments=2))
+    assert all(isinstance(error, ValueError)
+               for _, error in e.value.failures.values())
+
+
+def test_scan_map_reports_segments_of_exited_workers(fx_pipeline_test_model):
+    with raises(SegmentScanException) as e:
+        list(scan_map(fx_pipeline_test_model, lambda item: os._exit(1),
+                      total_segments=4, processes=1))
+    assert sorted(e.value.failures) == [0, 1, 2, 3]
+
+
+def test_scan_map_limit(fx_pipeline_test_model):
+    values = list(scan_map(fx_pipeline_test_model, lambda item: item.value,
+                           total_segments=2, processes=1, limit=5))
+    assert len(values) == 10
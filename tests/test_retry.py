@@ -0,0 +1,57 @@
+from _pytest.python import raises
+from boto.dynamodb2.exceptions import (ProvisionedThroughputExceededException,
+                                       ValidationException)
+from boto.exception import JSONResponseError
+
+from bynamodb.retry import RetryingConnection, RetryPolicy
+
+
+class FlakyConnection(object):
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def get_item(self, table_name, key):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'Item': key}
+
+
+def throttling():
+    return ProvisionedThroughputExceededException(
+        400, 'Bad Request',
+        {'__type': 'ProvisionedThroughputExceededException'})
+
+
+def test_retry_throttling_and_server_errors():
+    conn = FlakyConnection([throttling(),
+                            JSONResponseError(500, 'Internal Server Error')])
+    policy = RetryPolicy(base_delay=0.001)
+    result = RetryingConnection(conn, policy).get_item('Table', {'a': 1})
+    assert result == {'Item': {'a': 1}}
+    assert conn.calls == 3
+
+
+def test_not_retry_validation_error():
+    conn = FlakyConnection([ValidationException(400, 'Bad Request', {})])
+    with raises(ValidationException):
+        RetryingConnection(conn, RetryPolicy()).get_item('Table', {})
+    assert conn.calls == 1
+
+
+def test_retry_max_attempts():
+    conn = FlakyConnection([throttling() for _ in range(5)])
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    with raises(ProvisionedThroughputExceededException):
+        RetryingConnection(conn, policy).get_item('Table', {})
+    assert conn.calls == 3
+
+
+def test_retry_budget():
+    conn = FlakyConnection([throttling() for _ in range(5)])
+    policy = RetryPolicy(base_delay=0.001, retry_budget=RetryPolicy.retry_cost)
+    with raises(ProvisionedThroughputExceededException):
+        RetryingConnection(conn, policy).get_item('Table', {})
+    assert conn.calls == 2
@@ -0,0 +1,57 @@
+from bynamodb.attributes import NumberAttribute, StringSetAttribute
+from bynamodb.filterexps import AttributeValues
+from bynamodb.updateexps import (Add, Delete, IfNotExists, ListAppend, Path,
+                                 Remove, Set)
+
+
+def test_build_set():
+    update_exp, attr_values, attr_names = Set('name', 'value').build_exp()
+    assert update_exp == 'SET #1 = :1'
+    assert attr_values == {':1': {'S': 'value'}}
+    assert attr_names == {'#1': 'name'}
+
+
+def test_build_set_arithmetic():
+    update_exp, attr_values, attr_names = \
+        Set('count', Path('count') + 1).build_exp()
+    assert update_exp == 'SET #1 = #1 + :1'
+    assert attr_values == {':1': {'N': '1'}}
+    assert attr_names == {'#1': 'count'}
+
+
+def test_build_if_not_exists_and_list_append():
+    update_exp, attr_values, attr_names = Set(
+        'history',
+        ListAppend(IfNotExists('history', []), ['event'])).build_exp()
+    assert update_exp == 'SET #1 = list_append(if_not_exists(#1, :1), :2)'
+    assert attr_values == {':1': {'L': []}, ':2': {'L': [{'S': 'event'}]}}
+
+
+def test_build_nested_path():
+    update_exp, _, attr_names = Remove('a.b[0].a').build_exp()
+    assert update_exp == 'REMOVE #1.#2[0].#1'
+    assert attr_names == {'#1': 'a', '#2': 'b'}
+
+
+def test_build_composed_actions():
+    update = (Add('count', 1) & Delete('tags', {'old'}) &
+              Set('name', 'value') & Remove('removed'))
+    update_exp, attr_values, attr_names = update.build_exp()
+    assert update_exp == 'SET #3 = :3 REMOVE #4 ADD #1 :1 DELETE #2 :2'
+    assert attr_names == {'#1': 'count', '#2': 'tags', '#3': 'name',
+                          '#4': 'removed'}
+
+
+def test_build_with_attributes():
+    attributes = {'count': NumberAttribute(), 'tags': StringSetAttribute()}
+    _, attr_values, _ = (Add('count', 1.5) & Add('tags', {'new'})).build_exp(
+        attributes=attributes)
+    assert attr_values == {':1': {'N': '1.5'}, ':2': {'SS': ['new']}}
+
+
+def test_build_with_shared_values():
+    attr_values = AttributeValues()
+    attr_values.insert('condition')
+    update_exp, values, _ = Set('name', 'value').build_exp(attr_values)
+    assert update_exp == 'SET #1 = :2'
+    assert sorted(values) == [':1', ':2']